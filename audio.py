@@ -4,8 +4,6 @@ import pygame.midi
 import threading
 import numpy as np
 
-from scipy.stats import entropy
-
 from scales import generate_scale_notes, get_available_scales
 
 from typing import Optional
@@ -15,6 +13,11 @@ from logger import StructuredLogger
 
 logger = StructuredLogger.get_logger(__name__)
 
+# Channel voice status bytes for the events produced by generate_midi_events
+_MIDI_STATUS = {'note_on': 0x90, 'note_off': 0x80}
+# pygame.midi.Output.write accepts at most this many events per call
+_MIDI_WRITE_LIMIT = 1024
+
 class AudioGenerator:
     """
     Generates MIDI instructions from video frames and synthesizes audio.
@@ -31,18 +34,34 @@ class AudioGenerator:
         self.metric = self.config.DEFAULT_METRIC
         self.invert_metric = False
         self.midi_channel = midi_channel
+        self.target_hz = self.config.ANALYSIS_RATE_HZ
 
         self.total_regions = self.grid_width * self.grid_height
         self.note_map = self._create_note_map()
+        # Bumped whenever note_map or custom_note_mapping changes; invalidates _region_notes
+        self._mapping_version = 0
+        self._region_notes: Optional[np.ndarray] = None
+        self._mapped_notes: Optional[np.ndarray] = None
+        self._region_notes_version = -1
+        # (mapping version, per-region note) published for the UI; replaced whole, never mutated
+        self._region_notes_snapshot: tuple[int, tuple] = (-1, ())
+        self._last_frame_key: Optional[tuple] = None
         
         self.is_initialized = False
         self.midi_out = midi_out # Use the passed-in shared MIDI output
         self.current_notes: dict[int, int] = {}
         self.state_lock = threading.RLock()
         self._current_notes_snapshot: dict[int, int] = {}
+        self._notes_version = 0  # Bumped whenever the snapshot changes, so the UI can skip idle redraws
         
         self.custom_note_mapping = {}
 
+        # OpenCV's transparent API runs UMat operations on an OpenCL device when one exists
+        self._use_opencl = self.config.USE_OPENCL and cv2.ocl.haveOpenCL()
+        if self._use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+            logger.info("Frame downsampling will use OpenCL.")
+
         if self.midi_out is not None:
             self.is_initialized = True
             logger.info("AudioGenerator successfully linked to shared MIDI output.")
@@ -70,10 +89,13 @@ class AudioGenerator:
     
     def set_scale(self, scale_name, root_note):
         """Change scale and root note, recalculate note mapping."""
+        if (scale_name, root_note) == (self.scale_name, self.root_note):
+            return  # Settings are re-applied wholesale; leave the mapping and playing notes alone
         with self.state_lock:
             self.scale_name = scale_name
             self.root_note = root_note
             self.note_map = self._create_note_map()
+            self._mapping_version += 1
         self.stop_all_notes()  # Stop current notes as mapping changed
 
     def get_available_scales(self):
@@ -85,10 +107,13 @@ class AudioGenerator:
         Analyzes a video frame and extracts metric values for each grid region.
         Supports metrics: brightness, red_channel, green_channel, blue_channel,
         hue, saturation, contrast, color_temperature, color_entropy.
+
+        Returns a flat array of 0-1 values in region index (row-major) order, or
+        None when the metric cannot be computed for this frame.
         """
         # Early exit for empty frame
         if frame is None:
-            return {}
+            return None
 
         # Ensure valid frame dimensions
         ndim = frame.ndim
@@ -107,12 +132,15 @@ class AudioGenerator:
 
         metric = self.metric
         # Handle complex per-block metrics separately
+        if metric in ('contrast', 'color_temperature', 'color_entropy') and (rh == 0 or rw == 0):
+            # A grid finer than the frame leaves empty blocks; treat them as silent
+            return np.zeros(self.grid_width * self.grid_height)
         if metric == 'contrast':
             gray = simple_metrics['brightness'](frame)
             return self._compute_std(gray, rh, rw)
         if metric == 'color_temperature':
             if ndim != 3:
-                return {}
+                return None
             return self._compute_color_temp(frame, rh, rw)
         if metric == 'color_entropy':
             gray = simple_metrics['brightness'](frame)
@@ -122,136 +150,155 @@ class AudioGenerator:
         if metric in simple_metrics:
             processed = simple_metrics[metric](frame)
             if processed is None:
-                return {}
-            resized = cv2.resize(processed, (self.grid_width, self.grid_height), interpolation=cv2.INTER_AREA)
-            flat = resized.flatten().astype(np.float32)
+                return None
+            resized = self._downsample(processed)
+            flat = resized.ravel().astype(np.float32)
             if metric == 'hue':
                 flat /= 179.0
             else:
                 flat /= 255.0
-            return {i: flat[i] for i in range(self.grid_width * self.grid_height)}
+            return flat
 
         # Fallback to brightness
-        logger.error(f"Frame analysis error, couldn't use metric: {metric}")
+        logger.error("Frame analysis error, couldn't use metric: %s", metric)
         processed = simple_metrics['brightness'](frame)
-        resized = cv2.resize(processed, (self.grid_width, self.grid_height), interpolation=cv2.INTER_AREA)
-        flat = resized.flatten().astype(np.float32) / 255.0
-        return {i: flat[i] for i in range(self.grid_width * self.grid_height)}
+        resized = self._downsample(processed)
+        return resized.ravel().astype(np.float32) / 255.0
+
+    def _downsample(self, plane):
+        """Area-averages a single-channel plane down to the grid size."""
+        size = (self.grid_width, self.grid_height)
+        if self._use_opencl:
+            return cv2.resize(cv2.UMat(plane), size, interpolation=cv2.INTER_AREA).get()
+        return cv2.resize(plane, size, interpolation=cv2.INTER_AREA)
+
+    def _blocks(self, plane, rh, rw):
+        """Views a plane as (grid_height, rh, grid_width, rw[, C]) blocks, dropping remainder pixels."""
+        gh, gw = self.grid_height, self.grid_width
+        return plane[:gh*rh, :gw*rw].reshape(gh, rh, gw, rw, *plane.shape[2:])
 
     def _compute_std(self, gray, rh, rw):
-        values = {}
-        idx = 0
-        for gy in range(self.grid_height):
-            for gx in range(self.grid_width):
-                block = gray[gy*rh:(gy+1)*rh, gx*rw:(gx+1)*rw]
-                std = block.std() / 127.5
-                values[idx] = min(std, 1.0)
-                idx += 1
-        return values
+        std = self._blocks(gray, rh, rw).std(axis=(1, 3)) / 127.5
+        return np.minimum(std, 1.0).ravel()
 
     def _compute_color_temp(self, frame, rh, rw):
-        values = {}
-        idx = 0
-        for gy in range(self.grid_height):
-            for gx in range(self.grid_width):
-                block = frame[gy*rh:(gy+1)*rh, gx*rw:(gx+1)*rw]
-                r = block[:, :, 0].mean()
-                b = block[:, :, 2].mean()
-                temp = (r - b) / (r + b + 1e-6)
-                values[idx] = (temp + 1.0) / 2.0
-                idx += 1
-        return values
+        blocks = self._blocks(frame, rh, rw)
+        r = blocks[..., 0].mean(axis=(1, 3))
+        b = blocks[..., 2].mean(axis=(1, 3))
+        temp = (r - b) / (r + b + 1e-6)
+        return ((temp + 1.0) / 2.0).ravel()
 
     def _compute_entropy(self, gray, rh, rw):
-        from scipy.stats import entropy
-
-        values = {}
-        idx = 0
-        for gy in range(self.grid_height):
-            for gx in range(self.grid_width):
-                block = gray[gy*rh:(gy+1)*rh, gx*rw:(gx+1)*rw]
-                hist = cv2.calcHist([block], [0], None, [256], [0,256]).flatten()
-                probs = hist / hist.sum() if hist.sum() > 0 else np.zeros_like(hist)
-                ent = entropy(probs, base=2) / 8.0
-                values[idx] = min(ent, 1.0)
-                idx += 1
-        return values
+        gh, gw = self.grid_height, self.grid_width
+        cells = gh * gw
+        # Offset each block's pixel values by 256 * its region index so one bincount
+        # yields every block's 256-bin histogram
+        offsets = (np.arange(cells, dtype=np.intp) * 256).reshape(gh, 1, gw, 1)
+        hist = np.bincount((self._blocks(gray, rh, rw) + offsets).ravel(), minlength=cells * 256)
+        probs = hist.reshape(cells, 256) / float(rh * rw)
+        with np.errstate(divide='ignore'):
+            log_probs = np.where(probs > 0, np.log2(probs), 0.0)
+        ent = -(probs * log_probs).sum(axis=1) / 8.0
+        return np.minimum(ent, 1.0)
 
     def metric_to_velocity(self, metric):
         """Convert metric value (0-1) to MIDI velocity (0-127)."""
         velocity = int(metric * 127 * (self.sensitivity))
         return max(0, min(127, velocity))
     
-    def generate_midi_events(self, metric_values: dict[int, float]) -> list[tuple[str, int, int]]:
-        """Generate MIDI events from metric values."""
+    def _region_note_array(self):
+        """Per-region MIDI note (-1 where disabled or unmapped), cached until the mapping changes.
+
+        Must be called with state_lock held.
+        """
+        if self._region_notes_version != self._mapping_version:
+            region_notes = np.full(self.total_regions, -1, dtype=np.int16)
+            for region_index, note in self.note_map.items():
+                if region_index < self.total_regions:
+                    region_notes[region_index] = note
+            for region_index, note in self.custom_note_mapping.items():
+                if region_index < self.total_regions:
+                    region_notes[region_index] = note
+            mapped_notes = np.zeros(128, dtype=bool)
+            mapped_notes[region_notes[region_notes >= 0]] = True
+            self._region_notes, self._mapped_notes = region_notes, mapped_notes
+            self._region_notes_version = self._mapping_version
+        return self._region_notes, self._mapped_notes
+
+    def generate_midi_events(self, metric_values: Optional[np.ndarray]) -> list[tuple[str, int, int]]:
+        """Generate MIDI events from per-region metric values."""
         midi_events = []
+        if metric_values is None:
+            return midi_events
         
         with self.state_lock:
-            # First, build a complete mapping of region -> note for this frame
-            region_to_note = {}
-            for region_index in metric_values.keys():
-                # Check for custom note mapping first
-                if hasattr(self, 'custom_note_mapping') and region_index in self.custom_note_mapping:
-                    note = self.custom_note_mapping[region_index]
-                    if note == -1:  # Disabled region
-                        continue
-                    region_to_note[region_index] = note
-                elif region_index in self.note_map:
-                    region_to_note[region_index] = self.note_map[region_index]
-            
-            # Build reverse mapping: note -> list of regions that want to play it
-            note_to_regions = {}
-            for region_index, note in region_to_note.items():
-                if note not in note_to_regions:
-                    note_to_regions[note] = []
-                note_to_regions[note].append(region_index)
-            
-            # For each note, determine if it should play based on ANY of its regions
-            for note, regions in note_to_regions.items():
-                # Find the maximum metric value across all regions for this note
-                max_metric = 0
-                max_velocity = 0
-                should_play = False
-                
-                for region_index in regions:
-                    if region_index in metric_values:
-                        metric_value = metric_values[region_index]
-                        if self.invert_metric:
-                            metric_value = 1.0 - metric_value
-                        
-                        velocity = self.metric_to_velocity(metric_value)
-                        
-                        if metric_value > self.config.NOTE_ON_THRESHOLD:
-                            should_play = True
-                            if metric_value > max_metric:
-                                max_metric = metric_value
-                                max_velocity = velocity
-                
-                is_playing = note in self.current_notes
-                should_stop = max_metric <= self.config.NOTE_OFF_THRESHOLD
-                
-                if should_play and not is_playing:
+            region_notes, mapped_notes = self._region_note_array()
+            # The grid may have been resized between analysis and now
+            count = min(len(region_notes), len(metric_values))
+            region_notes = region_notes[:count]
+            values = metric_values[:count]
+            if self.invert_metric:
+                values = 1.0 - values
+
+            # A note plays when any of its regions is above the on-threshold, at the velocity
+            # of the strongest such region; velocity rises with the metric, so take the max
+            triggered = (values > self.config.NOTE_ON_THRESHOLD) & (region_notes >= 0)
+            velocities = np.clip((values * (127 * self.sensitivity)).astype(np.int16), 0, 127)
+            note_velocity = np.full(128, -1, dtype=np.int16)
+            np.maximum.at(note_velocity, region_notes[triggered], velocities[triggered])
+
+            # Only notes that start, stop or change velocity need a Python-level step
+            for note in np.flatnonzero(note_velocity >= 0).tolist():
+                max_velocity = int(note_velocity[note])
+                current_velocity = self.current_notes.get(note)
+                if current_velocity is None:
+                    midi_events.append(('note_on', note, max_velocity))
+                    self.current_notes[note] = max_velocity
+                elif abs(max_velocity - current_velocity) > self.config.VELOCITY_CHANGE_THRESHOLD:
+                    midi_events.append(('note_off', note, current_velocity))
                     midi_events.append(('note_on', note, max_velocity))
                     self.current_notes[note] = max_velocity
-                elif should_play and is_playing:
-                    current_velocity = self.current_notes[note]
-                    if abs(max_velocity - current_velocity) > self.config.VELOCITY_CHANGE_THRESHOLD:
-                        midi_events.append(('note_off', note, current_velocity))
-                        midi_events.append(('note_on', note, max_velocity))
-                        self.current_notes[note] = max_velocity
-                elif should_stop and is_playing:
-                    midi_events.append(('note_off', note, self.current_notes.get(note, 0)))
-                    del self.current_notes[note]
+
+            # Playing notes still mapped to a region but no longer triggered are released
+            for note in [n for n in self.current_notes if mapped_notes[n] and note_velocity[n] < 0]:
+                midi_events.append(('note_off', note, self.current_notes.pop(note)))
             
-            self._current_notes_snapshot = self.current_notes.copy()
+            if self.current_notes != self._current_notes_snapshot:
+                self._current_notes_snapshot = self.current_notes.copy()
+                self._notes_version += 1
         
         return midi_events
 
     def set_custom_note_mapping(self, region_index: int, note: int):
         """Set custom note mapping for a specific region. Use -1 to disable."""
-        if not hasattr(self, 'custom_note_mapping'):
+        with self.state_lock:
+            self.custom_note_mapping[region_index] = note
+            self._mapping_version += 1
+
+    def reset_custom_note_mapping(self):
+        """Drop all custom region notes, returning every region to the scale mapping."""
+        with self.state_lock:
             self.custom_note_mapping = {}
-        self.custom_note_mapping[region_index] = note
+            self._mapping_version += 1
+
+    def get_mapping_version(self) -> int:
+        """Return a counter that changes whenever the region-to-note mapping does."""
+        return self._mapping_version
+
+    def get_region_notes(self) -> tuple[int, tuple]:
+        """Return (mapping version, note per region) with custom mappings applied.
+
+        A note of -1 marks a disabled region and None an unmapped one. The tuple is
+        rebuilt only when the mapping changes, so unchanged reads take no lock.
+        """
+        snapshot = self._region_notes_snapshot
+        if snapshot[0] != self._mapping_version:
+            with self.state_lock:
+                region_notes = {**self.note_map, **self.custom_note_mapping}
+                snapshot = (self._mapping_version,
+                            tuple(region_notes.get(i) for i in range(self.total_regions)))
+                self._region_notes_snapshot = snapshot
+        return snapshot
 
     def set_invert_metric(self, invert: bool):
         """Set whether to invert the metric values."""
@@ -262,20 +309,27 @@ class AudioGenerator:
         """Get a thread-safe snapshot of current notes for UI display."""
         with self.state_lock:
             return self._current_notes_snapshot.copy()
+
+    def get_notes_version(self) -> int:
+        """Return a counter that changes whenever the current notes snapshot does."""
+        return self._notes_version
     
     def play_midi_events(self, midi_events):
         """Play MIDI events through the output device."""
-        if not self.is_initialized or not self.midi_out:
+        if not self.is_initialized or not self.midi_out or not midi_events:
             return
-            
-        for action, note, velocity in midi_events:
+        channel = self.midi_channel
+        if not 0 <= channel <= 15:
+            logger.error("MIDI playback error: channel %s is out of range", channel)
+            return
+
+        # One write per frame instead of a PortMidi call per note; timestamps are ignored at zero latency
+        messages = [[[_MIDI_STATUS[action] | channel, note, velocity], 0] for action, note, velocity in midi_events]
+        for start in range(0, len(messages), _MIDI_WRITE_LIMIT):
             try:
-                if action == 'note_on':
-                    self.midi_out.note_on(note, velocity, self.midi_channel)
-                elif action == 'note_off':
-                    self.midi_out.note_off(note, velocity, self.midi_channel)
+                self.midi_out.write(messages[start:start + _MIDI_WRITE_LIMIT])
             except Exception as e:
-                logger.error(f"MIDI playback error: {e}")
+                logger.error("MIDI playback error: %s", e)
     
     def process_frame(self, frame):
         """
@@ -286,6 +340,16 @@ class AudioGenerator:
         """
         if not self.is_initialized:
             return
+
+        # A static scene yields the same events as last time; skip it unless a setting or the notes moved
+        stride = self.config.DUPLICATE_FRAME_STRIDE
+        if stride > 0 and frame is not None:
+            frame_key = (hash(frame[::stride, ::stride].tobytes()), frame.shape,
+                         self._mapping_version, self._notes_version, self.metric, self.sensitivity,
+                         self.invert_metric, self.config.NOTE_ON_THRESHOLD, self.config.NOTE_OFF_THRESHOLD)
+            if frame_key == self._last_frame_key:
+                return
+            self._last_frame_key = frame_key
             
         # Analyze frame using selected metric
         metric_values = self.analyze_frame(frame)
@@ -304,32 +368,43 @@ class AudioGenerator:
                     if self.midi_out:
                         self.midi_out.note_off(note, self.current_notes[note], self.midi_channel)
                 except Exception as e:
-                    logger.error(f"Error stopping note {note}: {e}")
+                    logger.error("Error stopping note %s: %s", note, e)
             self.current_notes.clear()
+            if self._current_notes_snapshot:
+                self._current_notes_snapshot = {}
+                self._notes_version += 1
 
     def set_metric(self, metric: str):
         """Set the metric used for MIDI generation."""
+        if metric == self.metric:
+            return
         with self.state_lock:
             if metric in self.config.AVAILABLE_METRICS:
                 self.metric = metric
             else:
-                logger.warning(f"Invalid metric: {metric}")
+                logger.warning("Invalid metric: %s", metric)
         self.stop_all_notes()  # Stop current notes as metric changed
     
     def set_grid_size(self, width, height):
         """Change grid size and recalculate note mapping."""
+        if (width, height) == (self.grid_width, self.grid_height):
+            return
         with self.state_lock:
             self.grid_width = width
             self.grid_height = height
             self.total_regions = width * height
             self.note_map = self._create_note_map()
+            self._mapping_version += 1
         self.stop_all_notes()  # Stop current notes as mapping changed
 
     def set_note_range(self, min_note, max_note):
         """Change note range and recalculate note mapping."""
+        if (min_note, max_note) == tuple(self.note_range):
+            return
         with self.state_lock:
             self.note_range = (min_note, max_note)
             self.note_map = self._create_note_map()
+            self._mapping_version += 1
         self.stop_all_notes()  # Stop current notes as mapping changed
     
     def get_grid_visualization(self, frame):
@@ -399,14 +474,15 @@ class AudioGenerator:
                         if self.midi_out:
                             self.midi_out.note_off(note, vel)
                     except Exception as e:
-                        logger.error(f"Error stopping note {note}: {e}")
+                        logger.error("Error stopping note %s: %s", note, e)
                 self.current_notes.clear()
-                self._current_notes_snapshot.clear()
+                self._current_notes_snapshot = {}
+                self._notes_version += 1
             # Do not close or quit shared MIDI output here; it's managed globally
             self.is_initialized = False
             logger.info("Audio system cleaned up (notes stopped).")
         except Exception as e:
-            logger.error(f"An error occurred during audio cleanup: {e}", exc_info=True)
+            logger.error("An error occurred during audio cleanup: %s", e, exc_info=True)
     
     def __del__(self):
         """Destructor to ensure cleanup."""
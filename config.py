@@ -3,9 +3,12 @@ from dataclasses import dataclass
 
 class VideoConfig(NamedTuple):
     """Video processing configuration constants."""
-    DISPLAY_QUEUE_SIZE: int = 20
-    PROCESSING_QUEUE_SIZE: int = 200
-    UI_UPDATE_QUEUE_SIZE: int = 50
+    PROCESSING_QUEUE_SIZE: int = 2  # Kept small: frames waiting here are latency for the audio
+    PROCESSING_BATCH: int = 1  # Frames per frame_callback call; above 1 the callback gets an (N, ...) stack
+    SMOOTH_DISPLAY_SCALING: bool = False  # Bilinear display scaling instead of nearest-neighbour
+    PIN_THREADS: bool = False  # Pin decoder and processing threads to their own cores
+    USE_HWACCEL: bool = False  # Decode files on the GPU (NVDEC, VideoToolbox, D3D11VA) when available
+    HWACCEL_DEVICE: str = ''  # FFmpeg hwdevice type; empty picks the platform default
 
 @dataclass
 class AudioConfig:
@@ -24,6 +27,9 @@ class AudioConfig:
     ROOT_NOTE: int = 60
     DEFAULT_GRID_WIDTH: int = 20
     DEFAULT_GRID_HEIGHT: int = 1
+    USE_OPENCL: bool = False  # Downsample frames through cv2.UMat when an OpenCL device exists
+    DUPLICATE_FRAME_STRIDE: int = 16  # Pixel step of the fingerprint used to skip unchanged frames; 0 analyses every frame
+    ANALYSIS_RATE_HZ: float = 30.0  # Frames analysed per second; faster video is strided down, 0 analyses every frame
     DEFAULT_METRIC = "brightness"
     AVAILABLE_METRICS = [
         "brightness", 
@@ -36,10 +42,16 @@ class AudioConfig:
         "color_temperature",
         "color_entropy"
     ]
+    # Metrics computed from luma alone; the video pipeline can then hand over the Y plane only
+    LUMA_METRICS = ("brightness", "contrast", "color_entropy")
 
 class UIConfig(NamedTuple):
     """UI configuration constants."""
     WINDOW_GEOMETRY: str = '900x700'
+    GRID_OVERLAY_MIN_MS: int = 16  # Fastest grid overlay refresh while playing
+    GRID_OVERLAY_IDLE_MS: int = 200  # Grid overlay refresh while paused or idle
+    STATS_INTERVAL_MS: int = 500  # Status bar stats refresh while playing, run from the grid overlay tick
+    GRID_RESIZE_SETTLE_MS: int = 50  # Quiet period after the last canvas <Configure> before the grid is rebuilt
 
 
 @dataclass
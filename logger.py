@@ -1,4 +1,7 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Optional
 from config import LogConfig
@@ -8,6 +11,7 @@ class StructuredLogger:
     
     _loggers = {}
     _config = LogConfig()
+    _listener: Optional[logging.handlers.QueueListener] = None
     
     @classmethod
     def setup_logging(cls, config: Optional[LogConfig] = None) -> None:
@@ -21,24 +25,49 @@ class StructuredLogger:
         
         # Clear existing handlers
         root_logger.handlers.clear()
+        if cls._listener:
+            cls._listener.stop()
+            cls._listener = None
         
         formatter = logging.Formatter(cls._config.format)
+        handlers = []
         
         # Console handler
         if cls._config.enable_console:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setFormatter(formatter)
-            root_logger.addHandler(console_handler)
+            handlers.append(console_handler)
         
         # File handler
         if cls._config.enable_file:
             file_handler = logging.FileHandler(cls._config.file_path)
             file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
+            handlers.append(file_handler)
+        
+        if not handlers:
+            return
+        
+        # The decode and analysis threads log from their loops; hand records to a
+        # listener thread so stream and file writes never stall them
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        cls._listener = logging.handlers.QueueListener(log_queue, *handlers)
+        cls._listener.start()
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        """Flush queued records and stop the listener thread."""
+        if cls._listener:
+            cls._listener.stop()
+            cls._listener = None
     
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """Get or create a logger for the given name."""
         if name not in cls._loggers:
             cls._loggers[name] = logging.getLogger(name)
-        return cls._loggers[name]
\ No newline at end of file
+        return cls._loggers[name]
+
+
+# Registered once here rather than per setup_logging call; stopping an absent listener is a no-op
+atexit.register(StructuredLogger.shutdown)
@@ -0,0 +1,205 @@
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")  # audio.py needs OpenCV, which requirements.txt does not pin
+
+from audio import AudioGenerator
+
+
+def reference_events(generator, metric_values, current_notes):
+    """The per-region dict implementation generate_midi_events replaced; updates current_notes in place."""
+    config = generator.config
+    events = []
+
+    region_to_note = {}
+    for region_index in metric_values:
+        if region_index in generator.custom_note_mapping:
+            note = generator.custom_note_mapping[region_index]
+            if note == -1:  # Disabled region
+                continue
+            region_to_note[region_index] = note
+        elif region_index in generator.note_map:
+            region_to_note[region_index] = generator.note_map[region_index]
+
+    note_to_regions = {}
+    for region_index, note in region_to_note.items():
+        note_to_regions.setdefault(note, []).append(region_index)
+
+    for note, regions in note_to_regions.items():
+        max_metric = 0
+        max_velocity = 0
+        should_play = False
+        for region_index in regions:
+            metric_value = metric_values[region_index]
+            if generator.invert_metric:
+                metric_value = 1.0 - metric_value
+            velocity = generator.metric_to_velocity(metric_value)
+            if metric_value > config.NOTE_ON_THRESHOLD:
+                should_play = True
+                if metric_value > max_metric:
+                    max_metric = metric_value
+                    max_velocity = velocity
+
+        is_playing = note in current_notes
+        should_stop = max_metric <= config.NOTE_OFF_THRESHOLD
+        if should_play and not is_playing:
+            events.append(('note_on', note, max_velocity))
+            current_notes[note] = max_velocity
+        elif should_play and is_playing:
+            current_velocity = current_notes[note]
+            if abs(max_velocity - current_velocity) > config.VELOCITY_CHANGE_THRESHOLD:
+                events.append(('note_off', note, current_velocity))
+                events.append(('note_on', note, max_velocity))
+                current_notes[note] = max_velocity
+        elif should_stop and is_playing:
+            events.append(('note_off', note, current_notes.get(note, 0)))
+            del current_notes[note]
+
+    return events
+
+
+def by_note(events):
+    """Orders events by note while keeping each note's own events in sequence."""
+    return sorted(events, key=lambda event: event[1])
+
+
+def reference_blocks(plane, grid_width, grid_height, rh, rw):
+    """Yields each region's block the way the per-region metric loops sliced them."""
+    for gy in range(grid_height):
+        for gx in range(grid_width):
+            yield plane[gy*rh:(gy+1)*rh, gx*rw:(gx+1)*rw]
+
+
+def reference_std(gray, grid_width, grid_height, rh, rw):
+    return [min(block.std() / 127.5, 1.0) for block in reference_blocks(gray, grid_width, grid_height, rh, rw)]
+
+
+def reference_color_temp(frame, grid_width, grid_height, rh, rw):
+    values = []
+    for block in reference_blocks(frame, grid_width, grid_height, rh, rw):
+        r = block[:, :, 0].mean()
+        b = block[:, :, 2].mean()
+        values.append(((r - b) / (r + b + 1e-6) + 1.0) / 2.0)
+    return values
+
+
+def reference_entropy(gray, grid_width, grid_height, rh, rw, entropy):
+    values = []
+    for block in reference_blocks(gray, grid_width, grid_height, rh, rw):
+        hist = cv2.calcHist([block], [0], None, [256], [0, 256]).flatten()
+        probs = hist / hist.sum() if hist.sum() > 0 else np.zeros_like(hist)
+        values.append(min(entropy(probs, base=2) / 8.0, 1.0))
+    return values
+
+
+def metric_frames(grid_width, grid_height):
+    """Frames whose sides are not multiples of the grid, including single-colour regions."""
+    rng = np.random.default_rng(42)
+    # 12x13 blocks plus a remainder smaller than the grid, which analysis crops off
+    shape = (grid_height * 12 + grid_height - 1, grid_width * 13 + grid_width - 1, 3)
+    noisy = rng.integers(0, 256, shape, dtype=np.uint8)
+
+    # Every region one colour, with noise left only in the cropped-off remainder
+    flat = noisy.copy()
+    for gy in range(grid_height):
+        for gx in range(grid_width):
+            flat[gy*12:(gy+1)*12, gx*13:(gx+1)*13] = rng.integers(0, 256, 3, dtype=np.uint8)
+
+    mixed = noisy.copy()
+    mixed[:12, :13] = (200, 30, 90)  # One single-colour region among noisy ones
+    return [noisy, flat, mixed]
+
+
+@pytest.fixture
+def generator():
+    generator = AudioGenerator(midi_out=None)
+    generator.set_grid_size(8, 1)
+    return generator
+
+
+@pytest.mark.parametrize("invert", [False, True])
+@pytest.mark.parametrize("sensitivity", [1.0, 0.5])
+def test_events_match_reference(generator, invert, sensitivity):
+    generator.set_invert_metric(invert)
+    generator.set_sensitivity(sensitivity)
+    generator.set_custom_note_mapping(1, 60)
+    generator.set_custom_note_mapping(5, 60)  # Two custom regions share a note
+    generator.set_custom_note_mapping(2, generator.note_map[0])  # A custom region shares a scale note
+    generator.set_custom_note_mapping(3, -1)
+
+    # Multiples of 1/32 keep every velocity product exact, so both versions round alike
+    rng = np.random.default_rng(1234)
+    frames = [rng.integers(0, 33, generator.total_regions) / 32 for _ in range(60)]
+    frames += [np.zeros(generator.total_regions), np.ones(generator.total_regions)]
+
+    reference_notes = {}
+    for values in frames:
+        expected = reference_events(generator, dict(enumerate(values.tolist())), reference_notes)
+        assert by_note(generator.generate_midi_events(values)) == by_note(expected)
+        assert generator.current_notes == reference_notes
+
+
+def test_shared_note_plays_loudest_region(generator):
+    for region_index in range(generator.total_regions):
+        generator.set_custom_note_mapping(region_index, -1)
+    generator.set_custom_note_mapping(0, 60)
+    generator.set_custom_note_mapping(1, 60)
+
+    values = np.zeros(generator.total_regions)
+    values[:2] = (0.25, 0.75)
+    assert generator.generate_midi_events(values) == [('note_on', 60, generator.metric_to_velocity(0.75))]
+
+
+def test_disabled_regions_never_sound(generator):
+    for region_index in range(generator.total_regions):
+        generator.set_custom_note_mapping(region_index, -1)
+
+    assert generator.generate_midi_events(np.ones(generator.total_regions)) == []
+    assert generator.current_notes == {}
+
+
+GRID = (4, 3)
+
+
+@pytest.fixture
+def metric_generator():
+    generator = AudioGenerator(midi_out=None)
+    generator.set_grid_size(*GRID)
+    return generator
+
+
+def analyze(generator, metric, frame):
+    generator.set_metric(metric)
+    h, w = frame.shape[:2]
+    return generator.analyze_frame(frame), h // GRID[1], w // GRID[0]
+
+
+@pytest.mark.parametrize("frame", metric_frames(*GRID))
+def test_contrast_matches_reference(metric_generator, frame):
+    values, rh, rw = analyze(metric_generator, 'contrast', frame)
+    gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+
+    np.testing.assert_allclose(values, reference_std(gray, *GRID, rh, rw), rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("frame", metric_frames(*GRID))
+def test_color_temperature_matches_reference(metric_generator, frame):
+    values, rh, rw = analyze(metric_generator, 'color_temperature', frame)
+
+    np.testing.assert_allclose(values, reference_color_temp(frame, *GRID, rh, rw), rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("frame", metric_frames(*GRID))
+def test_color_entropy_matches_scipy_reference(metric_generator, frame):
+    entropy = pytest.importorskip("scipy.stats").entropy
+    values, rh, rw = analyze(metric_generator, 'color_entropy', frame)
+    gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+
+    np.testing.assert_allclose(values, reference_entropy(gray, *GRID, rh, rw, entropy), rtol=1e-9, atol=1e-12)
+
+
+def test_single_colour_regions_have_zero_contrast_and_entropy(metric_generator):
+    flat = metric_frames(*GRID)[1]
+
+    assert not analyze(metric_generator, 'contrast', flat)[0].any()
+    assert not analyze(metric_generator, 'color_entropy', flat)[0].any()
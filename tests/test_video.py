@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("av")
+pytest.importorskip("cv2")
+
+import video
+from video import ColorRange, VideoManager
+
+
+class FakeContainer:
+    """Stands in for an av InputContainer whose first decode may fail."""
+    def __init__(self, hwaccel, decode_error=None):
+        self.hwaccel = hwaccel
+        self.decode_error = decode_error
+        self.closed = False
+
+    def decode(self, video=0):
+        if self.decode_error:
+            raise self.decode_error
+        return iter([object()])
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def fake_open(opened, open_error=None, decode_error=None):
+    """Returns an av.open replacement that fails as configured whenever a hardware device is requested."""
+    def open_(path, options=None, hwaccel=None):
+        if hwaccel is not None and open_error:
+            raise open_error
+        container = FakeContainer(hwaccel, decode_error if hwaccel is not None else None)
+        opened.append(container)
+        return container
+    return open_
+
+
+def test_falls_back_to_software_when_device_fails_at_open(monkeypatch):
+    opened = []
+    monkeypatch.setattr(video.av, "open", fake_open(opened, open_error=RuntimeError("no CUDA device")))
+
+    container = video._open_with_hwaccel_fallback("clip.mp4", {}, hwaccel=object())
+
+    assert container.hwaccel is None
+    assert opened == [container]
+
+
+def test_falls_back_to_software_when_first_decode_fails(monkeypatch):
+    opened = []
+    monkeypatch.setattr(video.av, "open", fake_open(opened, decode_error=RuntimeError("hwaccel init failed")))
+
+    container = video._open_with_hwaccel_fallback("clip.mp4", {}, hwaccel=object())
+
+    assert container.hwaccel is None
+    probe = opened[0]
+    assert probe.hwaccel is not None and probe.closed
+
+
+def test_keeps_working_device(monkeypatch):
+    opened = []
+    monkeypatch.setattr(video.av, "open", fake_open(opened))
+    hwaccel = object()
+
+    container = video._open_with_hwaccel_fallback("clip.mp4", {}, hwaccel=hwaccel)
+
+    assert container.hwaccel is hwaccel and not container.closed
+    assert opened[0].closed  # The probe container is released
+
+
+def test_software_only_skips_probe(monkeypatch):
+    opened = []
+    monkeypatch.setattr(video.av, "open", fake_open(opened))
+
+    container = video._open_with_hwaccel_fallback("clip.mp4", {}, hwaccel=None)
+
+    assert container.hwaccel is None
+    assert opened == [container]
+
+
+def yuv420p_frame(y_value, color_range):
+    """A 16x16 yuv420p frame with a uniform luma plane and the given range tag."""
+    array = np.full((24, 16), 128, dtype=np.uint8)  # The (H * 3 / 2, W) layout from_ndarray expects
+    array[:16] = y_value
+    frame = video.av.VideoFrame.from_ndarray(array, format='yuv420p')
+    frame.color_range = color_range
+    return frame
+
+
+@pytest.mark.parametrize("y_value", [16, 128, 235])
+def test_full_range_tagged_yuv420p_luma_is_not_rescaled(y_value):
+    luma = VideoManager._luma_plane(yuv420p_frame(y_value, ColorRange.JPEG))
+
+    assert luma.shape == (16, 16)
+    assert (luma == y_value).all()
+
+
+@pytest.mark.parametrize("color_range", [ColorRange.MPEG, ColorRange.UNSPECIFIED])
+@pytest.mark.parametrize("y_value, expected", [(16, 0), (235, 255), (0, 0), (255, 255)])
+def test_limited_range_yuv420p_luma_is_expanded(color_range, y_value, expected):
+    luma = VideoManager._luma_plane(yuv420p_frame(y_value, color_range))
+
+    assert (luma == expected).all()
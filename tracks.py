@@ -34,10 +34,10 @@ class MidiTrack:
         self.note_off_threshold = self.audio_config.NOTE_OFF_THRESHOLD
 
         # Tkinter variables for data binding
-        self.grid_width_var = tk.StringVar(value=str(self.grid_width))
-        self.grid_height_var = tk.StringVar(value=str(self.grid_height))
-        self.min_note_var = tk.StringVar(value=str(self.note_range[0]))
-        self.max_note_var = tk.StringVar(value=str(self.note_range[1]))
+        self.grid_width_var = tk.IntVar(value=self.grid_width)
+        self.grid_height_var = tk.IntVar(value=self.grid_height)
+        self.min_note_var = tk.IntVar(value=self.note_range[0])
+        self.max_note_var = tk.IntVar(value=self.note_range[1])
         self.sensitivity_var = tk.DoubleVar(value=self.sensitivity)
         self.scale_var = tk.StringVar(value=self.current_scale)
         self.root_note_var = tk.StringVar(value=get_note_names()[self.current_root_note - 60])
@@ -59,11 +59,11 @@ class MidiTrack:
             self.audio_generator = AudioGenerator(midi_out=self.midi_out, midi_channel=self.track_id)
             self.update_audio_generator_settings()
         except Exception as e:
-            logger.error(f"Track {self.track_id} audio generator init error: {e}")
+            logger.error("Track %s audio generator init error: %s", self.track_id, e)
             messagebox.showerror("Audio Error", f"Failed to initialize audio for Track {self.track_id}:\n{e}")
             
     def reset_custom_note_map(self):
-        self.audio_generator.custom_note_mapping = {}
+        self.audio_generator.reset_custom_note_mapping()
 
     def update_audio_generator_settings(self):
         """Applies all current settings to the audio generator instance."""
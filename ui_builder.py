@@ -1,15 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import atexit
 import os
 import time
 
 import pygame.midi 
 import pygame.mixer 
 
-from video import VideoManager  
-from audio import AudioGenerator 
-
 from scales import get_available_scales, get_note_names
 
 from typing import Optional
@@ -19,6 +15,20 @@ from tracks import MidiTrack
 
 logger = StructuredLogger.get_logger(__name__)
 
+# Menu bar layout: (menu label, entries), each entry (label, callback name) or None for a separator
+_MENU_ENTRIES = (
+    ("File", (("New Project", "_menu_action"), ("Open Project", "_menu_action"), ("Save Project", "_menu_action"),
+              ("Save Project As", "_menu_action"), None, ("Exit", "_menu_action"))),
+    ("Input", (("Video File", "open_video"), ("Camera", "open_camera"), ("Input Settings", "_menu_action"))),
+    ("Output", (("Save MIDI File", "_menu_action"), ("Record MIDI", "_menu_action"), None,
+                ("Audio Device", "_menu_action"))),
+    ("Presets", (("Load Preset", "_menu_action"), ("Save Preset", "_menu_action"), ("Manage Presets", "_menu_action"),
+                 None, ("Factory Reset", "_menu_action"))),
+    ("View", (("Show Visual Feedback", "_menu_action"), ("Show Filter Preview", "_menu_action"),
+              ("Fullscreen Video", "_menu_action"))),
+    ("Help", (("About", "_menu_action"), ("Documentation", "_menu_action"))),
+)
+
 class UIBuilder:
     def __init__(self, parent_window, callbacks):
         self.callbacks = callbacks
@@ -26,58 +36,33 @@ class UIBuilder:
 
     def _create_menu(self):
         menubar = tk.Menu(self.parent_window)
-        # File menu
-        file_menu = tk.Menu(menubar, tearoff=0)
-        for label in ["New Project", "Open Project", "Save Project", "Save Project As", None, "Exit"]:
-            if label:
-                file_menu.add_command(label=label, command=self.callbacks["_menu_action"])
-            else:
-                file_menu.add_separator()
-        menubar.add_cascade(label="File", menu=file_menu)
-        
-        # Input menu
-        input_menu = tk.Menu(menubar, tearoff=0)
-        input_menu.add_command(label="Video File", command=self.callbacks["open_video"])
-        input_menu.add_command(label="Camera", command=self.callbacks["open_camera"])
-        input_menu.add_command(label="Input Settings", command=self.callbacks["_menu_action"])
-        menubar.add_cascade(label="Input", menu=input_menu)
-        
-        # Output menu
-        output_menu = tk.Menu(menubar, tearoff=0)
-        self.parent_window.midi_device_menu = tk.Menu(output_menu, tearoff=0)
-        output_menu.add_cascade(label="Virtual MIDI Port", menu=self.parent_window.midi_device_menu)
-        # Populate the menu
-        self.callbacks["_populate_midi_devices"]()
-        output_menu.add_command(label="Save MIDI File", command=self.callbacks["_menu_action"])
-        output_menu.add_command(label="Record MIDI", command=self.callbacks["_menu_action"])
-        output_menu.add_separator()
-        output_menu.add_command(label="Audio Device", command=self.callbacks["_menu_action"])
-        menubar.add_cascade(label="Output", menu=output_menu)
-        
-        # Presets menu
-        presets_menu = tk.Menu(menubar, tearoff=0)
-        presets_menu.add_command(label="Load Preset", command=self.callbacks["_menu_action"])
-        presets_menu.add_command(label="Save Preset", command=self.callbacks["_menu_action"])
-        presets_menu.add_command(label="Manage Presets", command=self.callbacks["_menu_action"])
-        presets_menu.add_separator()
-        presets_menu.add_command(label="Factory Reset", command=self.callbacks["_menu_action"])
-        menubar.add_cascade(label="Presets", menu=presets_menu)
-        
-        # View menu
-        view_menu = tk.Menu(menubar, tearoff=0)
-        view_menu.add_command(label="Show Visual Feedback", command=self.callbacks["_menu_action"])
-        view_menu.add_command(label="Show Filter Preview", command=self.callbacks["_menu_action"])
-        view_menu.add_command(label="Fullscreen Video", command=self.callbacks["_menu_action"])
-        menubar.add_cascade(label="View", menu=view_menu)
-        
-        # Help menu
-        help_menu = tk.Menu(menubar, tearoff=0)
-        help_menu.add_command(label="About", command=self.callbacks["_menu_action"])
-        help_menu.add_command(label="Documentation", command=self.callbacks["_menu_action"])
-        menubar.add_cascade(label="Help", menu=help_menu)
+        # Each callback is registered as a Tcl command once and shared by every entry using it
+        commands = {}
+        for label, entries in _MENU_ENTRIES:
+            menu = tk.Menu(menubar, tearoff=0)
+            if label == "Output":
+                self.parent_window.midi_device_menu = tk.Menu(menu, tearoff=0)
+                menu.add_cascade(label="Virtual MIDI Port", menu=self.parent_window.midi_device_menu)
+                # Populate the menu
+                self.callbacks["_populate_midi_devices"]()
+            self._add_menu_entries(menu, entries, commands)
+            menubar.add_cascade(label=label, menu=menu)
 
         self.parent_window.config(menu=menubar)
 
+    def _add_menu_entries(self, menu: tk.Menu, entries: tuple, commands: dict) -> None:
+        """Adds (label, callback name) entries to a menu; None adds a separator."""
+        add_command = menu.add_command
+        for entry in entries:
+            if entry is None:
+                menu.add_separator()
+                continue
+            label, callback_name = entry
+            command = commands.get(callback_name)
+            if command is None:
+                command = commands[callback_name] = self.parent_window.register(self.callbacks[callback_name])
+            add_command(label=label, command=command)
+
     def _create_main_layout(self) -> None:
         """Creates the main paned layout of the application."""
         paned = ttk.Panedwindow(self.parent_window, orient=tk.HORIZONTAL)
@@ -107,6 +92,7 @@ class UIBuilder:
         self.parent_window.grid_canvas = tk.Canvas(self.parent_window.grid_frame, highlightthickness=0)
         self.parent_window.grid_canvas.pack(fill=tk.BOTH, expand=True)
         self.parent_window.grid_canvas.bind("<Button-1>", self.callbacks["_on_grid_click"])
+        self.parent_window.grid_canvas.bind("<Configure>", self.callbacks["_on_grid_resize"])
         
         return self.parent_window.video_frame
 
@@ -151,9 +137,12 @@ class UIBuilder:
     def _create_status_bar(self):
         status_bar = ttk.Frame(self.parent_window, relief=tk.SUNKEN)
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-        self.parent_window.status_msg = ttk.Label(status_bar, text="Ready")
+        # Text is driven through variables so updates are a plain set() rather than a widget configure
+        self.parent_window.status_var = tk.StringVar(value="Ready")
+        self.parent_window.stats_var = tk.StringVar(value="FPS: -- | Target FPS: -- | Latency: -- | Target Latency: --")
+        self.parent_window.status_msg = ttk.Label(status_bar, textvariable=self.parent_window.status_var)
         self.parent_window.status_msg.pack(side=tk.LEFT, padx=5)
-        self.parent_window.stats_lbl = ttk.Label(status_bar, text="FPS: -- | Target FPS: -- | Latency: -- | Target Latency: --")
+        self.parent_window.stats_lbl = ttk.Label(status_bar, textvariable=self.parent_window.stats_var)
         self.parent_window.stats_lbl.pack(side=tk.RIGHT, padx=5)
 
     def _create_audio_controls(self, parent: ttk.Frame, track: MidiTrack) -> None:
@@ -217,11 +206,9 @@ class UIBuilder:
         note_frame.pack(pady=5, fill="x")
         ttk.Label(note_frame, text="Note Range:").pack(side=tk.LEFT)
         ttk.Label(note_frame, text="Min:").pack(side=tk.LEFT, padx=(10, 0))
-        ttk.Spinbox(note_frame, from_=0, to=127, width=5, textvariable=track.min_note_var).pack(side=tk.LEFT, padx=5)
+        self._create_settings_spinbox(note_frame, 0, track.min_note_var)
         ttk.Label(note_frame, text="Max:").pack(side=tk.LEFT, padx=(10, 0))
-        ttk.Spinbox(note_frame, from_=0, to=127, width=5, textvariable=track.max_note_var).pack(side=tk.LEFT, padx=5)
-        track.min_note_var.trace_add('write', lambda *_: self.callbacks["_debounced_update_track_settings"]())
-        track.max_note_var.trace_add('write', lambda *_: self.callbacks["_debounced_update_track_settings"]())
+        self._create_settings_spinbox(note_frame, 0, track.max_note_var)
 
         scale_frame = ttk.Frame(group)
         scale_frame.pack(pady=5, fill="x")
@@ -243,13 +230,18 @@ class UIBuilder:
         size_frame.pack(pady=5, fill="x")
         ttk.Label(size_frame, text="Grid Size:").pack(side=tk.LEFT)
         ttk.Label(size_frame, text="Width:").pack(side=tk.LEFT, padx=(10, 0))
-        ttk.Spinbox(size_frame, from_=1, to=127, width=5, textvariable=track.grid_width_var).pack(side=tk.LEFT, padx=5)
+        self._create_settings_spinbox(size_frame, 1, track.grid_width_var)
         ttk.Label(size_frame, text="Height:").pack(side=tk.LEFT, padx=(10, 0))
-        ttk.Spinbox(size_frame, from_=1, to=127, width=5, textvariable=track.grid_height_var).pack(side=tk.LEFT, padx=5)
+        self._create_settings_spinbox(size_frame, 1, track.grid_height_var)
         ttk.Button(size_frame, text="Reset custom notes", command=track.reset_custom_note_map).pack(side=tk.LEFT, padx=5)
 
-        track.grid_width_var.trace_add('write', lambda *_: self.callbacks["_debounced_update_track_settings"]())
-        track.grid_height_var.trace_add('write', lambda *_: self.callbacks["_debounced_update_track_settings"]())
+    def _create_settings_spinbox(self, parent: ttk.Frame, from_: int, variable: tk.IntVar) -> None:
+        """Creates a spinbox (up to 127) whose edits apply on arrow clicks, Return or focus loss rather than per keystroke."""
+        spinbox = ttk.Spinbox(parent, from_=from_, to=127, width=5, textvariable=variable,
+                              command=self.callbacks["_debounced_update_track_settings"])
+        spinbox.pack(side=tk.LEFT, padx=5)
+        spinbox.bind("<Return>", self.callbacks["_apply_track_settings"])
+        spinbox.bind("<FocusOut>", self.callbacks["_apply_track_settings"])
 
     def _create_track_tab(self, track: MidiTrack) -> ttk.Frame:
         """Creates a new tab for a given track with all its controls."""
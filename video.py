@@ -1,12 +1,15 @@
 import av
+from av.video.reformatter import VideoReformatter, ColorRange
+from av.codec.hwaccel import HWAccel
 import tkinter as tk
 from PIL import Image, ImageTk
 import threading
-import queue
 import time
-import numpy as np
 import cv2
+import numpy as np
 import platform
+import os
+from enum import IntEnum
 
 from typing import Optional, Callable
 from config import VideoConfig
@@ -14,12 +17,190 @@ from logger import StructuredLogger
 
 logger = StructuredLogger.get_logger(__name__)
 
+# Pixel formats whose first plane is a full-resolution 8-bit luma plane, split by the range
+# they imply when a frame does not tag its own. Plain yuv*/nv* luma defaults to limited range
+# (16-235), while the rgb24 path and swscale's gray output are full range, so limited-range
+# planes must be rescaled before analysis
+_FULL_RANGE_LUMA_FORMATS = frozenset({'gray', 'yuvj420p', 'yuvj422p', 'yuvj444p'})
+_LIMITED_RANGE_LUMA_FORMATS = frozenset({'nv12', 'nv21', 'yuv420p', 'yuv422p', 'yuv444p'})
+# Expands limited-range luma to full range: (y - 16) * 255 / 219, clamped
+_LIMITED_TO_FULL_LUMA = np.clip(np.rint((np.arange(256) - 16) * (255 / 219)), 0, 255).astype(np.uint8)
+
+# Hardware decoder tried per platform when VideoConfig.USE_HWACCEL is set
+_HWACCEL_DEVICES = {'Windows': 'd3d11va', 'Darwin': 'videotoolbox', 'Linux': 'cuda'}
+
+
+class PlaybackState(IntEnum):
+    """Playback state shared between the UI and worker threads."""
+    STOPPED = 0
+    PLAYING = 1
+    PAUSED = 2
+
+
+class SPSCRing:
+    """
+    Lock-free single-producer/single-consumer ring buffer. Only the producer
+    writes `_head` and only the consumer writes `_tail`; both are plain ints,
+    so under the GIL neither side needs a lock. One slot stays empty to tell a
+    full ring from an empty one. An Event provides blocking waits for the
+    consumer without a Condition notify on every put.
+    """
+    def __init__(self, min_capacity: int):
+        size = 1 << max(1, min_capacity).bit_length()  # Power of two holding min_capacity items
+        self._buf: list = [None] * size
+        self._mask = size - 1
+        self._head = 0
+        self._tail = 0
+        self._ready = threading.Event()
+
+    @property
+    def capacity(self) -> int:
+        return self._mask
+
+    def __len__(self) -> int:
+        return (self._head - self._tail) & self._mask
+
+    def try_put(self, item) -> bool:
+        """Producer side. Returns False without blocking when the ring is full."""
+        head = self._head
+        next_head = (head + 1) & self._mask
+        if next_head == self._tail:
+            return False
+        self._buf[head] = item
+        self._head = next_head
+        self._ready.set()
+        return True
+
+    def try_get(self):
+        """Consumer side. Returns None without blocking when the ring is empty."""
+        tail = self._tail
+        if tail == self._head:
+            return None
+        item = self._buf[tail]
+        self._buf[tail] = None
+        self._tail = (tail + 1) & self._mask
+        return item
+
+    def get(self, timeout: float):
+        """Consumer side. Waits up to `timeout` seconds for an item, returning None on timeout."""
+        item = self.try_get()
+        if item is None:
+            self._ready.clear()
+            # Re-check after clearing so a put racing with clear() is not missed
+            item = self.try_get()
+            if item is None:
+                self._ready.wait(timeout)
+                item = self.try_get()
+        return item
+
+    def wake(self) -> None:
+        """Wakes a consumer blocked in get(), e.g. during shutdown."""
+        self._ready.set()
+
+
+class LatestSlot:
+    """
+    Single-item handoff where the producer always overwrites. The consumer only
+    ever sees the newest item, so a stalled consumer skips stale frames instead
+    of replaying a backlog. The consumer polls; there is no blocking get.
+    """
+    def __init__(self):
+        self._item = None
+        self._lock = threading.Lock()
+
+    def publish(self, item):
+        """Producer side. Stores `item` and returns the unconsumed item it replaced, if any."""
+        with self._lock:
+            stale, self._item = self._item, item
+        return stale
+
+    def take(self):
+        """Consumer side. Returns the pending item, or None when there is none."""
+        with self._lock:
+            item, self._item = self._item, None
+        return item
+
+
+def _tune_current_thread(core_slot: Optional[int], raise_priority: bool = False) -> None:
+    """
+    Optionally pins the calling thread to one of the available cores and raises
+    its scheduling priority. Core slot 0 is the first usable core; the remaining
+    cores are left for the Tk main loop. A core_slot of None leaves affinity
+    alone. Failures are logged and ignored.
+    """
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            if core_slot is not None:
+                cores = sorted(os.sched_getaffinity(0))
+                # Only pin when there is at least one core left over for the UI
+                if len(cores) > core_slot + 1:
+                    os.sched_setaffinity(threading.get_native_id(), {cores[core_slot]})
+            if raise_priority:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), -5)
+        elif platform.system() == 'Windows':
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            thread = kernel32.GetCurrentThread()
+            if core_slot is not None and (os.cpu_count() or 1) > core_slot + 1:
+                kernel32.SetThreadAffinityMask(thread, 1 << core_slot)
+            if raise_priority:
+                kernel32.SetThreadPriority(thread, 1)  # THREAD_PRIORITY_ABOVE_NORMAL
+    except (OSError, AttributeError) as e:
+        logger.debug("Could not tune worker thread: %s", e)
+
+
+def _set_fine_timer_resolution(enable: bool) -> None:
+    """
+    Requests (or releases) 1 ms timer resolution on Windows, where time.sleep
+    otherwise rounds up to the ~15.6 ms system tick. No-op elsewhere.
+    """
+    if platform.system() != 'Windows':
+        return
+    try:
+        import ctypes
+        winmm = ctypes.windll.winmm
+        if enable:
+            winmm.timeBeginPeriod(1)
+        else:
+            winmm.timeEndPeriod(1)
+    except Exception as e:
+        logger.debug("Could not change timer resolution: %s", e)
+
+
+def _open_with_hwaccel_fallback(path: str, options: dict, hwaccel: Optional[HWAccel]) -> av.container.InputContainer:
+    """
+    Opens a media file for decoding, on the hardware device when one is given.
+    A missing or unusable device is not detected when the HWAccel is built,
+    only at codec open or on the first decoded frame, so one frame is decoded
+    from a throwaway container first; on any failure the file is reopened for
+    software decoding.
+    """
+    if hwaccel is not None:
+        try:
+            with av.open(path, options=options, hwaccel=hwaccel) as probe:
+                next(probe.decode(video=0), None)
+            return av.open(path, options=options, hwaccel=hwaccel)
+        except Exception as e:
+            logger.warning("Hardware decoding failed, decoding in software: %s", e)
+    return av.open(path, options=options)
+
+
 class VideoManager:
     """
     Manages video playback using PyAV (FFmpeg bindings) in a unified pipeline.
-    It handles decoding, display, and frame processing in separate threads for
-    better performance and synchronization.
+    Decoding and frame processing run on worker threads; the Tk thread shows the
+    newest decoded frame from a timer that only runs while playing, so the
+    workers never make a Tcl call.
+
+    The array passed to frame_callback is a read-only view into FFmpeg's frame
+    memory; consumers that need to modify it must take their own copy. With
+    VideoConfig.PROCESSING_BATCH above 1 the callback instead receives a
+    (N, H, W[, C]) stack of frames in a reused buffer, which is only valid for
+    the duration of the call and must be copied if retained.
     """
+    # FFmpeg threading options, applied at codec open rather than after it
+    _DECODER_OPTIONS = {'threads': 'auto'}
+
     def __init__(self,
                 video_panel: tk.Widget,
                 frame_callback: Optional[Callable[[np.ndarray], None]] = None,
@@ -28,6 +209,8 @@ class VideoManager:
         self.video_panel = video_panel
         self.frame_callback = frame_callback
         self.config = config or VideoConfig()
+        # Pixel format handed to frame_callback: 'rgb24' or 'gray' (luma plane only)
+        self.processing_format: str = 'rgb24'
 
         # PyAV and video state
         self.container: Optional[av.container.Container] = None
@@ -36,51 +219,67 @@ class VideoManager:
         self.current_time: float = 0.0
 
         # Threading and queueing infrastructure
-        self.display_queue: queue.Queue = queue.Queue(maxsize=self.config.DISPLAY_QUEUE_SIZE)
-        self.processing_queue: queue.Queue = queue.Queue(maxsize=self.config.PROCESSING_QUEUE_SIZE)
-        self.ui_update_queue: queue.Queue = queue.Queue(maxsize=self.config.UI_UPDATE_QUEUE_SIZE)
+        self.display_slot = LatestSlot()
+        self.processing_queue = SPSCRing(self.config.PROCESSING_QUEUE_SIZE)
+        # Cleared by the processing thread while its ring is nearly full, so the decoder skips conversion
+        self._processing_ready: bool = True
+
+        # sws contexts are not thread-safe, so the decoder thread and the Tk thread each own one
+        self._reformatter = VideoReformatter()
+        self._display_reformatter = VideoReformatter()
 
         self.decoder_thread: Optional[threading.Thread] = None
-        self.display_thread: Optional[threading.Thread] = None
         self.processing_thread: Optional[threading.Thread] = None
         
         self.stop_event = threading.Event()
-        self.pause_event = threading.Event()
 
-        # state lock for thread safety
+        # Writers take the state lock; readers rely on a single GIL-atomic attribute load
         self._state_lock = threading.RLock()  # Use RLock for re-entrant access
         self._state_condition = threading.Condition(self._state_lock)
-        self._is_playing = False
+        self._state: PlaybackState = PlaybackState.STOPPED
 
         self.current_fps: float = 0.0
         self.processing_latency: float = 0.0
         self._frame_count: int = 0
         self._frame_count_start_time: float = time.time()
 
+        # Persistent panel image, reallocated only when the frame size changes
+        self._tk_photo: Optional[ImageTk.PhotoImage] = None
+        self._tk_size: tuple = (0, 0)
+
+        # Panel size cached from <Configure> so the per-frame path never queries Tk
+        self._panel_w: int = self.video_panel.winfo_width()
+        self._panel_h: int = self.video_panel.winfo_height()
+        self.video_panel.bind('<Configure>', self._on_panel_resize, add='+')
+
+        # Display timer; after() registers and deletes a Tcl command on every call, so register it once
+        self._display_poll_cmd = self.video_panel.register(self._poll_display)
+        self._display_poll_id: Optional[str] = None
+
+        # Skip display conversion while the panel cannot be seen (e.g. window minimized)
+        self._panel_visible: bool = True
+        for widget in (self.video_panel, self.video_panel.winfo_toplevel()):
+            widget.bind('<Map>', self._on_panel_visibility, add='+')
+            widget.bind('<Unmap>', self._on_panel_visibility, add='+')
+
     def open(self, path):
         """Opens a video file, sets up streams, and starts the decoder thread."""
         self.cleanup()  # Ensure previous resources are released
 
         try:
-            self.container = av.open(path)
+            self.container = _open_with_hwaccel_fallback(path, self._DECODER_OPTIONS, self._hwaccel())
             self.video_stream = self.container.streams.video[0]
+            self._configure_decoder_threading()
             self.fps = self.video_stream.average_rate
-            
-            # Attempt to enable hardware acceleration
-            try:
-                self.video_stream.codec_context.thread_count = 0  # Auto-detect threads
-            except Exception as e:
-                logger.warning(f"Could not set thread count: {e}")
 
             self.stop_event.clear()
-            self.pause_event.clear()
 
             # Start the decoding process
             self.decoder_thread = threading.Thread(target=self._decoder_loop, daemon=True)
             self.decoder_thread.start()
 
         except Exception as e:
-            logger.error(f"Error opening video file with PyAV: {e}")
+            logger.error("Error opening video file with PyAV: %s", e)
             self.cleanup()
             raise
 
@@ -94,210 +293,322 @@ class VideoManager:
             system = platform.system()
             if system == 'Windows':
                 # We're not getting the camera name automatically right now, to get it, run ffmpeg -list_devices true -f dshow -i dummy
-                self.container = av.open(f'video=LUMIX Webcam Software', format='dshow')
+                self.container = av.open(f'video=LUMIX Webcam Software', format='dshow', options=self._DECODER_OPTIONS)
             elif system == 'Darwin':
-                self.container = av.open(f'{camera_index}:', format='avfoundation')
+                self.container = av.open(f'{camera_index}:', format='avfoundation', options=self._DECODER_OPTIONS)
             else:  # Linux
-                self.container = av.open(f'/dev/video{camera_index}', format='v4l2')
+                self.container = av.open(f'/dev/video{camera_index}', format='v4l2', options=self._DECODER_OPTIONS)
 
             # Get video stream and FPS
             self.video_stream = self.container.streams.video[0]
+            self._configure_decoder_threading()
             try:
                 self.fps = float(self.video_stream.average_rate)
             except:
                 self.fps = 30.0  # Default FPS if unavailable
 
-            # Hardware acceleration setup
-            try:
-                self.video_stream.codec_context.thread_count = 0
-            except Exception as e:
-                logger.warning(f"Could not set thread count: {e}")
-
             self.stop_event.clear()
-            self.pause_event.clear()
 
             # Start decoding thread
             self.decoder_thread = threading.Thread(target=self._decoder_loop, daemon=True)
             self.decoder_thread.start()
 
         except Exception as e:
-            logger.error(f"Error opening camera with PyAV: {e}")
+            logger.error("Error opening camera with PyAV: %s", e)
             self.cleanup()
             raise
 
+    def _hwaccel(self) -> Optional[HWAccel]:
+        """Returns the hardware decoder to request, or None to decode in software."""
+        if not self.config.USE_HWACCEL:
+            return None
+        device = self.config.HWACCEL_DEVICE or _HWACCEL_DEVICES.get(platform.system())
+        if not device:
+            return None
+        try:
+            # Codecs with no hardware config for the device decode in software; a missing or
+            # broken device only fails later and is handled by _open_with_hwaccel_fallback
+            return HWAccel(device_type=device, allow_software_fallback=True)
+        except Exception as e:
+            logger.warning("Hardware decoding with %s unavailable: %s", device, e)
+            return None
+
+    def _configure_decoder_threading(self):
+        """Enables frame and slice threading; must run before the first decode() call."""
+        try:
+            self.video_stream.codec_context.thread_type = 'AUTO'
+        except Exception as e:
+            logger.warning("Could not set decoder thread type: %s", e)
+
+    def _update_skip_mode(self, skip_mode: str, lagging: bool) -> str:
+        """
+        Switches the decoder to skipping non-reference frames while the pipeline is
+        lagging or the processing ring is nearly full, and back once it has drained.
+        Returns the mode now in effect.
+        """
+        fill = len(self.processing_queue) / self.processing_queue.capacity
+        if lagging or fill > 0.8:
+            wanted = 'NONREF'
+        elif fill < 0.2:
+            wanted = 'DEFAULT'
+        else:
+            return skip_mode
+
+        if wanted != skip_mode:
+            try:
+                self.video_stream.codec_context.skip_frame = wanted
+            except Exception as e:
+                logger.debug("Could not set decoder skip_frame: %s", e)
+                return skip_mode
+            logger.info("Decoder skip_frame set to %s", wanted)
+        return wanted
+
     def play(self):
         """Starts or resumes playback."""
         if not self.container:
             return
 
         with self._state_condition:
-            if self.pause_event.is_set():
-                self.pause_event.clear()
+            if self._state == PlaybackState.PLAYING:
+                return
+
+            self._state = PlaybackState.PLAYING
+            self._state_condition.notify_all()  # Wake up waiting threads
+            self._arm_display_poll()
             
-            if not self._is_playing:
-                self._is_playing = True
-                self._state_condition.notify_all()  # Wake up waiting threads
-                
-                # Start consumer threads only once
-                if not self.display_thread or not self.display_thread.is_alive():
-                    self.display_thread = threading.Thread(target=self._display_loop, daemon=True)
-                    self.display_thread.start()
-                
-                if self.frame_callback and (not self.processing_thread or not self.processing_thread.is_alive()):
-                    self.processing_thread = threading.Thread(target=self._processing_loop, daemon=True)
-                    self.processing_thread.start()
+            # Start the processing thread only once; display is pumped from the Tk loop
+            if self.frame_callback and (not self.processing_thread or not self.processing_thread.is_alive()):
+                self.processing_thread = threading.Thread(target=self._processing_loop, daemon=True)
+                self.processing_thread.start()
 
     def pause(self):
         """Pauses video playback."""
         with self._state_condition:
-            self.pause_event.set()
+            self._state = PlaybackState.PAUSED
             self._state_condition.notify_all()
 
     def is_playing(self):
         """Returns True if the video is currently playing."""
-        with self._state_lock:
-            return self._is_playing and not self.pause_event.is_set()
+        return self._state == PlaybackState.PLAYING
 
     def stop(self):
         """Stops video playback and cleans up resources."""
         self.cleanup()
 
     def _decoder_loop(self):
-        start_time = time.perf_counter()
-        first_pts = None
-        frames_behind = 0
+        _tune_current_thread(core_slot=0 if self.config.PIN_THREADS else None, raise_priority=True)
+        _set_fine_timer_resolution(True)
+        # A decode error escapes the loop below, and the timer resolution must still be released
+        try:
+            # Pacing runs on integer nanoseconds from a monotonic clock
+            start_ns = time.monotonic_ns()
+            first_pts = None
+            frames_behind = 0
+            frame_interval_ns = int(1_000_000_000 / self.fps) if self.fps else 33_333_333
+            # Split the Fraction time base once so the per-frame math stays on plain ints and floats
+            time_base = self.video_stream.time_base
+            time_base_num_ns, time_base_den = time_base.numerator * 1_000_000_000, time_base.denominator
+            time_base_s = float(time_base)
+            skip_mode = 'DEFAULT'
+            lag_skips = 0
+            next_load_check_ns = start_ns + 1_000_000_000
         
-        for frame in self.container.decode(video=0):
-            if self.stop_event.is_set():
-                break
-            
-            while self.pause_event.is_set():
+            for frame in self.container.decode(video=0):
                 if self.stop_event.is_set():
                     break
-                time.sleep(0.01)
             
-            try:
-                # Initialize timing on first frame
-                if first_pts is None:
-                    first_pts = frame.pts
-                    start_time = time.perf_counter()
-                
-                # Calculate when this frame should be displayed
-                pts_offset = (frame.pts - first_pts) * self.video_stream.time_base
-                target_time = start_time + pts_offset
-                current_time = time.perf_counter()
+                # Block until play() or cleanup() notifies instead of polling the state
+                with self._state_condition:
+                    while self._state == PlaybackState.PAUSED and not self.stop_event.is_set():
+                        self._state_condition.wait()
+            
+                try:
+                    # Initialize timing on first frame
+                    if first_pts is None:
+                        first_pts = frame.pts
+                        start_ns = time.monotonic_ns()
                 
-                # Check if we're behind schedule
-                time_until_display = target_time - current_time
+                    # Calculate when this frame should be displayed
+                    target_ns = start_ns + (frame.pts - first_pts) * time_base_num_ns // time_base_den
+                    now_ns = time.monotonic_ns()
                 
-                if time_until_display < -0.1:  # More than 100ms behind
-                    # We're too far behind - skip this frame
-                    frames_behind += 1
-                    if frames_behind % 10 == 0:
-                        logger.warning(f"Skipped {frames_behind} frames due to processing lag")
-                    continue
+                    # Check if we're behind schedule
+                    until_display_ns = target_ns - now_ns
+
+                    # Once a second, shed non-reference frames at the decoder while overloaded
+                    if now_ns >= next_load_check_ns:
+                        skip_mode = self._update_skip_mode(skip_mode, lag_skips > 0)
+                        lag_skips = 0
+                        next_load_check_ns = now_ns + 1_000_000_000
                 
-                frames_behind = 0  # Reset counter when caught up
+                    if until_display_ns < -100_000_000:  # More than 100ms behind
+                        # We're too far behind - skip this frame
+                        frames_behind += 1
+                        lag_skips += 1
+                        if frames_behind % 10 == 0:
+                            logger.warning("Skipped %s frames due to processing lag", frames_behind)
+                        continue
                 
-                # Sleep until it's time to display this frame
-                if time_until_display > 0.001:
-                    time.sleep(time_until_display)
+                    frames_behind = 0  # Reset counter when caught up
+
+                    # Slightly late: shift the clock so at most one frame of lateness carries
+                    # over, instead of pushing frames back-to-back until caught up
+                    if until_display_ns < -frame_interval_ns:
+                        start_ns -= until_display_ns + frame_interval_ns
+                        until_display_ns = -frame_interval_ns
                 
-                # Convert frame
-                frame_np = frame.to_ndarray(format='rgb24')
-                self.current_time = frame.pts * self.video_stream.time_base
+                    # Sleep until it's time to display this frame; cleanup() cuts the wait short
+                    if until_display_ns > 1_000_000 and self.stop_event.wait(until_display_ns / 1e9):
+                        break
                 
-                # Non-blocking queue puts with frame dropping if full
-                try:
-                    self.display_queue.put_nowait(frame_np)
-                except queue.Full:
-                    # Drop oldest frame and try again
-                    try:
-                        self.display_queue.get_nowait()
-                        self.display_queue.put_nowait(frame_np)
-                    except (queue.Empty, queue.Full):
-                        pass
-                        
-                if self.frame_callback:
-                    try:
-                        self.processing_queue.put_nowait(frame_np)
-                    except queue.Full:
-                        try:
-                            self.processing_queue.get_nowait()
-                            self.processing_queue.put_nowait(frame_np)
-                        except (queue.Empty, queue.Full):
-                            pass
-
-            except Exception as e:
-                logger.error(f"Decoder loop error: {e}")
-                break
+                    self.current_time = frame.pts * time_base_s
 
-    def _display_loop(self):
-        """Displays frames from NumPy arrays in the display queue."""
-        last_panel_size = (0, 0)
-        
-        while not self.stop_event.is_set():
-            try:
-                frame_np = self.display_queue.get(timeout=0.5)
-                
-                # Check for sentinel value (cleanup signal)
-                if frame_np is None:
+                    # The display timer scales and converts the decoded frame itself;
+                    # latest frame wins and skip it entirely while the panel is hidden
+                    if self._panel_visible:
+                        self.display_slot.publish(frame)
+                        
+                    # Views keep their frame's buffers alive, so only rescaled limited-range luma is copied; a full ring drops the frame
+                    if self.frame_callback and self._processing_ready:
+                        if self.processing_format == 'gray':
+                            self.processing_queue.try_put(self._luma_plane(frame))
+                        else:
+                            self.processing_queue.try_put(self._rgb_view(frame))
+
+                except Exception as e:
+                    logger.error("Decoder loop error: %s", e)
                     break
 
-                # Cache panel dimensions to avoid repeated winfo calls
-                panel_w, panel_h = self.video_panel.winfo_width(), self.video_panel.winfo_height()
-                
-                if panel_w > 1 and panel_h > 1:
-                    # Only resize if dimensions changed or first time
-                    if (panel_w, panel_h) != last_panel_size:
-                        last_panel_size = (panel_w, panel_h)
-                    
-                    # Use faster interpolation
-                    resized_frame = cv2.resize(frame_np, (panel_w, panel_h), interpolation=cv2.INTER_NEAREST)
-                else:
-                    resized_frame = frame_np
+        finally:
+            _set_fine_timer_resolution(False)
+
+    def _rgb_view(self, frame: av.VideoFrame) -> np.ndarray:
+        """Converts a decoded frame to RGB and returns an (H, W, 3) view of the result."""
+        # The reformatter keeps its scaler context across frames
+        rgb = self._reformatter.reformat(frame, format='rgb24')
+        plane = rgb.planes[0]
+        src = np.frombuffer(plane, dtype=np.uint8, count=plane.line_size * frame.height)
+        return src.reshape(frame.height, plane.line_size)[:, :frame.width * 3].reshape(frame.height, frame.width, 3)
+
+    @staticmethod
+    def _luma_plane(frame: av.VideoFrame) -> np.ndarray:
+        """Returns the frame's full-range luma as an (H, W) array, viewing the Y plane in place when possible."""
+        name = frame.format.name
+        if name not in _FULL_RANGE_LUMA_FORMATS and name not in _LIMITED_RANGE_LUMA_FORMATS:
+            return frame.to_ndarray(format='gray')
+        plane = frame.planes[0]
+        luma = np.frombuffer(plane, dtype=np.uint8, count=plane.line_size * frame.height)
+        luma = luma.reshape(frame.height, plane.line_size)[:, :frame.width]
+        # The frame's own range tag wins (phones often tag yuv420p as full range); the format
+        # name only decides for untagged frames
+        color_range = frame.color_range
+        if color_range in (ColorRange.MPEG, ColorRange.JPEG):
+            limited = color_range == ColorRange.MPEG
+        else:
+            limited = name in _LIMITED_RANGE_LUMA_FORMATS
+        if limited:
+            # One table lookup per pixel, far cheaper than an swscale gray pass
+            return cv2.LUT(luma, _LIMITED_TO_FULL_LUMA)
+        return luma
+
+    def _on_panel_resize(self, event):
+        """Caches the panel size. Runs on the Tk thread."""
+        self._panel_w, self._panel_h = event.width, event.height
+
+    def _on_panel_visibility(self, event=None):
+        """Tracks whether the video panel is viewable. Runs on the Tk thread."""
+        self._panel_visible = bool(self.video_panel.winfo_viewable())
+
+    def _scale_to_panel(self, frame: av.VideoFrame) -> Image.Image:
+        """Scales a decoded frame to the panel size and converts it to RGB in a single sws_scale pass."""
+        panel_w, panel_h = self._panel_w, self._panel_h
+        if panel_w <= 1 or panel_h <= 1:
+            panel_w, panel_h = frame.width, frame.height
+
+        interpolation = 'BILINEAR' if self.config.SMOOTH_DISPLAY_SCALING else 'POINT'
+        rgb = self._display_reformatter.reformat(frame, width=panel_w, height=panel_h,
+                                                 format='rgb24', interpolation=interpolation)
+        # Wrap the plane in place; its rows may be padded past width * 3
+        plane = rgb.planes[0]
+        return Image.frombuffer('RGB', (panel_w, panel_h), plane, 'raw', 'RGB', plane.line_size, 1)
+
+    def _arm_display_poll(self):
+        """Starts the display timer unless it is already pending. Runs on the Tk thread."""
+        if self._display_poll_id is None:
+            self._display_poll_id = self.video_panel.tk.call('after', self._display_poll_ms(), self._display_poll_cmd)
+
+    def _display_poll_ms(self) -> int:
+        """Half a frame interval, so a decoded frame waits at most that long to be shown."""
+        return max(4, int(500 / self.fps)) if self.fps else 16
+
+    def _poll_display(self):
+        """Shows the newest decoded frame and re-arms while playing. Runs on the Tk thread."""
+        self._display_poll_id = None
+        self.process_ui_updates()
+        # One last pass after a pause shows the frame decoded just before it
+        if self._state == PlaybackState.PLAYING:
+            self._arm_display_poll()
+
+    def _cancel_display_poll(self):
+        """Stops the display timer."""
+        if self._display_poll_id is None:
+            return
+        try:
+            self.video_panel.tk.call('after', 'cancel', self._display_poll_id)
+        except (tk.TclError, RuntimeError) as e:
+            logger.debug("Could not cancel display timer: %s", e)
+        self._display_poll_id = None
 
-                # Create image more efficiently
-                img = Image.fromarray(resized_frame, 'RGB')
-                photo = ImageTk.PhotoImage(img)
-                
-                # Queue UI update instead of direct access
-                try:
-                    self.ui_update_queue.put_nowait(photo)
-                except queue.Full:
-                    pass  # Drop frame if UI update queue is full
-            except queue.Empty:
-                with self._state_lock:
-                    if not self._is_playing and not self.pause_event.is_set():
-                        break
-            except Exception as e:
-                logger.error(f"Display loop error: {e}")
-                break
-    
     def process_ui_updates(self):
-        """Process pending UI updates from worker threads. Call this from main thread."""
+        """Shows the most recently decoded frame, if any. Call this from main thread."""
         try:
-            while True:
-                photo = self.ui_update_queue.get_nowait()
-                self._update_display(photo)
-        except queue.Empty:
-            pass
+            frame = self.display_slot.take()
+            if frame is not None:
+                self._update_display(self._scale_to_panel(frame))
         except Exception as e:
-            logger.error(f"UI update processing error: {e}")
+            logger.error("UI update processing error: %s", e)
+
+    def _update_display(self, img: Image.Image):
+        """Pastes a frame into the persistent panel image, recreating it only when the size changes."""
+        if self._tk_photo is None or self._tk_size != img.size:
+            self._tk_photo = ImageTk.PhotoImage('RGB', img.size)
+            self._tk_size = img.size
+            self.video_panel.config(image=self._tk_photo)
+            self.video_panel.image = self._tk_photo
+        self._tk_photo.paste(img)
 
-    def _update_display(self, photo):
-        """Update display in main thread."""
-        self.video_panel.config(image=photo)
-        self.video_panel.image = photo
-    
     def _processing_loop(self):
-        """Processes NumPy frames from the processing queue."""
+        """Processes frames from the processing queue."""
+        _tune_current_thread(core_slot=1 if self.config.PIN_THREADS else None)
+        batch_size = max(1, self.config.PROCESSING_BATCH)
+        batch: Optional[np.ndarray] = None
+        batch_len = 0
         while not self.stop_event.is_set():
             try:
-                frame_rgb = self.processing_queue.get(timeout=0.5)
+                frame_np = self.processing_queue.get(timeout=0.5)
                 
-                if frame_rgb is None:
-                    break
+                if frame_np is None:
+                    # Timed out on an empty ring, so the decoder must not stay gated
+                    self._processing_ready = True
+                    if self._state == PlaybackState.STOPPED:
+                        self.current_fps = 0
+                        break
+                    continue
+
+                # Unbatched, only the newest waiting frame is analysed so slow audio never lags the video
+                if batch_size == 1:
+                    newer = self.processing_queue.try_get()
+                    while newer is not None:
+                        frame_np, newer = newer, self.processing_queue.try_get()
+
+                # Backpressure with hysteresis: one flag check in the decoder instead of a failed put.
+                # Counted after any drain and in frames rather than a fill fraction, so a small ring can
+                # still close the gate (at most one slot free) and an emptied one always reopens it
+                waiting = len(self.processing_queue)
+                if waiting and waiting >= self.processing_queue.capacity - 1:
+                    self._processing_ready = False
+                elif waiting == 0:
+                    self._processing_ready = True
                 
                 # Measure processing latency
                 processing_start = time.time()
@@ -310,25 +621,44 @@ class VideoManager:
                     self._frame_count = 0
                     self._frame_count_start_time = time.time()
                 
-                frame_gray = frame_rgb
-
-                if self.frame_callback:
-                    try:
-                        self.frame_callback(frame_gray)
-                    except Exception as e:
-                        logger.error(f"Frame callback error: {e}")
+                if batch_size == 1:
+                    self._run_frame_callback(frame_np)
+                else:
+                    # Copy into the batch so the frame's buffers are returned to FFmpeg straight away
+                    if batch is None or batch.shape[1:] != frame_np.shape:
+                        if batch_len:
+                            self._run_frame_callback(batch[:batch_len])
+                        batch = np.empty((batch_size,) + frame_np.shape, dtype=np.uint8)
+                        batch_len = 0
+                    batch[batch_len] = frame_np
+                    batch_len += 1
+                    if batch_len == batch_size:
+                        self._run_frame_callback(batch)
+                        batch_len = 0
                 
                 # Calculate actual latency
                 self.processing_latency = time.time() - processing_start
 
-            except queue.Empty:
-                if not self._is_playing and not self.pause_event.is_set():
-                    self.current_fps = 0
-                    break
             except Exception as e:
-                logger.error(f"Processing loop error: {e}")
+                logger.error("Processing loop error: %s", e)
                 break
 
+        # Flush a partial batch on shutdown
+        if batch_len:
+            self._run_frame_callback(batch[:batch_len])
+
+    def _run_frame_callback(self, frames: np.ndarray) -> None:
+        """Invokes frame_callback, logging rather than propagating its errors."""
+        if self.frame_callback is None:
+            return
+        # Every generator sees the same buffer, so hand out a read-only view instead of trusting callers
+        frames = frames.view()
+        frames.flags.writeable = False
+        try:
+            self.frame_callback(frames)
+        except Exception as e:
+            logger.error("Frame callback error: %s", e)
+
     def get_time(self):
         """Returns the current playback time in seconds."""
         return float(self.current_time)
@@ -348,7 +678,7 @@ class VideoManager:
                 self.container.seek(int(target_ts))
                 self.current_time = target_ts / av.time_base # Update time immediately
             except Exception as e:
-                logger.error(f"Seek error: {e}")
+                logger.error("Seek error: %s", e)
 
     def get_latency(self):
         """Returns the last measured frame processing latency in seconds."""
@@ -358,12 +688,16 @@ class VideoManager:
         """Returns the current processing framerate."""
         return self.current_fps
 
+    def get_stats_snapshot(self) -> tuple[bool, float, float]:
+        """Returns (is_playing, current processing fps, latency in seconds) in one call."""
+        return self._state == PlaybackState.PLAYING, self.current_fps, self.processing_latency
+
     def _join_thread(self, thread: Optional[threading.Thread], name: str, timeout: float = 2.0) -> None:
         """Joins a thread with a timeout and logs a warning on failure."""
         if thread and thread.is_alive():
             thread.join(timeout=timeout)
             if thread.is_alive():
-                logger.warning(f"{name} thread did not terminate cleanly.")
+                logger.warning("%s thread did not terminate cleanly.", name)
 
     def cleanup(self) -> None:
         """Stops all threads and releases video resources."""
@@ -372,25 +706,23 @@ class VideoManager:
         
         # Atomically stop all operations
         with self._state_condition:
-            self._is_playing = False
+            self._state = PlaybackState.STOPPED
             self.stop_event.set()
             self._state_condition.notify_all()
         
-        # Unblock threads waiting on queues
-        for q in [self.display_queue, self.processing_queue]:
-            try:
-                q.put_nowait(None)
-            except queue.Full:
-                pass
+        # Unblock the processing thread waiting on its ring
+        self.processing_queue.wake()
+        self._cancel_display_poll()
         
         # Wait for threads to finish
         self._join_thread(self.decoder_thread, "Decoder")
-        self._join_thread(self.display_thread, "Display")
         self._join_thread(self.processing_thread, "Processing")
         
-        # Safely clear queues
-        for q in [self.display_queue, self.processing_queue, self.ui_update_queue]:
-            self._clear_queue_safely(q)
+        # Safely clear queues; the consumers have exited so this thread may drain them
+        self.display_slot.take()
+        while self.processing_queue.try_get() is not None:
+            pass
+        self._processing_ready = True
 
         # Close PyAV container
         if self.container:
@@ -398,22 +730,11 @@ class VideoManager:
                 self.container.close()
                 logger.info("Video container closed.")
             except Exception as e:
-                logger.error(f"Error closing video container: {e}", exc_info=True)
+                logger.error("Error closing video container: %s", e, exc_info=True)
             finally:
                 self.container = None
                 self.video_stream = None
 
-    def _clear_queue_safely(self, q):
-        """Safely clear a queue without holding the mutex too long."""
-        try:
-            while True:
-                try:
-                    q.get_nowait()
-                except queue.Empty:
-                    break
-        except Exception as e:
-            logger.error(f"Error clearing queue: {e}")
-    
     def __del__(self):
         """Destructor to ensure cleanup."""
         self.cleanup()
\ No newline at end of file
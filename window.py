@@ -1,26 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import atexit
 import os
 import time
 
 import pygame.midi 
 import pygame.mixer 
 
-from video import VideoManager  
 from audio import AudioGenerator 
 
 from scales import get_available_scales, get_note_names
 
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from config import UIConfig, AudioConfig, VideoConfig
 from logger import StructuredLogger
 from tracks import MidiTrack
 
 from ui_builder import UIBuilder
 
+if TYPE_CHECKING:
+    # Imported on first use: PyAV and its FFmpeg libraries are not needed to show the window
+    from video import VideoManager
+
 logger = StructuredLogger.get_logger(__name__)
 
+_VIDEO_FILETYPES = (("Video Files", "*.mp4 *.mov *.avi *.mkv *.wmv *.flv *.webm"), ("All Files", "*"))
+# Grid cell fill per MIDI velocity (white fading to magenta) and label per note, built once
+_VELOCITY_COLORS = tuple(f"#ff{255 - min(255, velocity * 2):02x}ff" for velocity in range(128))
+_NOTE_LABELS = tuple(f"N{note}" for note in range(128))
+
 class MainWindow(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -35,6 +42,7 @@ class MainWindow(tk.Tk):
                         "open_video":self.open_video,
                         "open_camera":self.open_camera,
                         "_on_grid_click":self._on_grid_click,
+                        "_on_grid_resize":self._on_grid_resize,
                         "add_track":self.add_track,
                         "remove_track":self.remove_track,
                         "on_track_selected":self.on_track_selected,
@@ -47,6 +55,7 @@ class MainWindow(tk.Tk):
                         "toggle_invert_metric":self.toggle_invert_metric,
                         "_on_threshold_change":self._on_threshold_change,
                         "_debounced_update_track_settings":self._debounced_update_track_settings,
+                        "_apply_track_settings":self._apply_track_settings,
                         "on_root_note_change":self.on_root_note_change,
                         "_populate_midi_devices":self._populate_midi_devices,
                         "on_scale_change":self.on_scale_change
@@ -56,10 +65,14 @@ class MainWindow(tk.Tk):
 
         self.geometry(self.ui_config.WINDOW_GEOMETRY)
 
-        self.video_manager: Optional[VideoManager] = None
+        self.video_manager: Optional['VideoManager'] = None
         self.current_video_path: Optional[str] = None
 
         self.tracks: list[MidiTrack] = []
+        # Generators fed by _process_frame; rebuilt whenever tracks or their audio toggle change
+        self._active_generators: list[AudioGenerator] = []
+        self._stop_note_callables: list = []
+        self._frame_handlers: list = []
         self.track_notebook: Optional[ttk.Notebook] = None
         self.active_track_index: int = -1
         self.next_track_id = 0
@@ -67,6 +80,23 @@ class MainWindow(tk.Tk):
         
         self.update_timer = None
         self.grid_overlay_timer_id = None
+        self._grid_redraw_pending = False  # grid_overlay_timer_id is an idle callback rather than the periodic tick
+        self._next_stats_at = 0.0  # time.monotonic() deadline for the next stats refresh
+        self.status_error_timer_id = None
+        self._last_stats_text: Optional[str] = None
+        # Persistent grid overlay items, rebuilt only when the canvas size or grid dimensions change
+        self._grid_layout_key: Optional[tuple] = None
+        self._grid_canvas_w = 0  # Canvas size cached from <Configure> to avoid winfo round-trips per tick
+        self._grid_canvas_h = 0
+        self.grid_resize_timer_id = None
+        self._grid_pending_size = (0, 0)  # Latest <Configure> size, adopted once resizing settles
+        self._cell_rects: list[int] = []
+        self._cell_texts: list[int] = []
+        self._cell_states: list[Optional[tuple]] = []
+        # Identity of the note data last drawn; the cell pass is skipped while it is unchanged
+        self._grid_notes_seen: Optional[tuple] = None
+        # Values derived once per loaded media for the status bar; None when nothing is loaded
+        self._media_constants: Optional[dict] = None
 
         self.current_camera_index = None  # Track active camera
         self.selected_midi_device_id = None
@@ -76,13 +106,10 @@ class MainWindow(tk.Tk):
         # Create UI
         self.ui_builder.build_menu()
 
-        self._update_grid_overlay()
+        self._request_grid_redraw()
         
         self.add_track() # Add the first initial track
 
-        self._update_stats() # start stat update loop
-        self._process_ui_updates() # start ui update loop
-
     def _initialize_global_audio(self):
         """Initializes global Pygame systems and the single MIDI output stream."""
         try:
@@ -112,16 +139,12 @@ class MainWindow(tk.Tk):
                 
             self.midi_out = pygame.midi.Output(midi_device_id)
             device_info = pygame.midi.get_device_info(midi_device_id)
-            logger.info(f"Successfully initialized shared MIDI output on device: {device_info[1].decode()}") 
+            logger.info("Successfully initialized shared MIDI output on device: %s", device_info[1].decode()) 
             
         except Exception as e:
-            logger.error(f"Global audio initialization error: {e}", exc_info=True)
+            logger.error("Global audio initialization error: %s", e, exc_info=True)
             messagebox.showerror("Audio Error", f"A critical error occurred initializing the audio system:\n{e}")
 
-    def _on_frame_configure(self, event):
-        # Could be used if resizing video window changes viewport
-        pass
-
     def _menu_action(self):
         # Placeholder
         pass
@@ -132,32 +155,76 @@ class MainWindow(tk.Tk):
             try:
                 # Ensure the frame is fully mapped before initializing video
                 self.video_frame.update_idletasks()
+                from video import VideoManager
                 self.video_manager = VideoManager(self.video_panel, frame_callback=self._process_frame)
+                self._update_processing_format()
                 logger.info("Video manager initialized successfully")
                 
-                # Rebind window handle on resize
-                self.video_frame.bind("<Configure>", self._on_frame_configure)
-                
             except Exception as e:
-                logger.error(f"Video initialization failed: {e}")
-                self.status_msg.config(text=f"Video Error: {e}")
+                logger.error("Video initialization failed: %s", e)
+                self.status_var.set(f"Video Error: {e}")
 
     def _process_frame(self, frame):
         """Process video frame for audio generation across all enabled tracks."""
         if frame is None:
             return
             
-        try:
-            for track in self.tracks:
-                if track.audio_enabled and track.audio_generator:
-                    track.audio_generator.process_frame(frame)
-        except Exception as e:
-            logger.error(f"Frame processing error: {e}")
+        # Batched delivery stacks frames along a leading axis
+        frames = frame if self.video_manager.config.PROCESSING_BATCH > 1 else (frame,)
+        handlers = self._frame_handlers
+        for frame in frames:
+            for handler in handlers:
+                handler(frame)
+
+    def _refresh_active_generators(self):
+        """Rebuilds the cached list of audio-enabled generators."""
+        # Replaced rather than mutated, since the processing thread iterates it
+        self._active_generators = [track.audio_generator for track in self.tracks
+                                   if track.audio_enabled and track.audio_generator]
+        # Disabled tracks already released their notes when toggled off
+        self._stop_note_callables = [generator.stop_all_notes for generator in self._active_generators]
+        video_fps = self.video_manager.get_fps() if self.video_manager else 0.0
+        self._frame_handlers = [self._guard_frame_handler(generator, self._frame_stride(generator, video_fps))
+                                for generator in self._active_generators]
+
+    @staticmethod
+    def _frame_stride(generator: AudioGenerator, video_fps: float) -> int:
+        """Number of frames per analysed frame so a generator runs at about its target rate."""
+        if generator.target_hz <= 0 or video_fps <= generator.target_hz:
+            return 1
+        return max(1, round(video_fps / generator.target_hz))
+
+    @staticmethod
+    def _guard_frame_handler(generator: AudioGenerator, stride: int = 1):
+        """Wraps a generator's process_frame so one failing track does not skip the others."""
+        process_frame = generator.process_frame
+        channel = generator.midi_channel
+        frame_count = stride - 1  # The first frame after a rebuild is analysed
+
+        def handler(frame):
+            nonlocal frame_count
+            frame_count += 1
+            if frame_count < stride:
+                return
+            frame_count = 0
+            try:
+                process_frame(frame)
+            except Exception as e:
+                logger.error("Frame processing error on channel %s: %s", channel, e)
+        return handler
+
+    def _update_processing_format(self):
+        """Requests luma-only frames when no enabled track needs colour."""
+        if not self.video_manager:
+            return
+        luma_only = all(track.current_metric in AudioConfig.LUMA_METRICS
+                        for track in self.tracks if track.audio_enabled)
+        self.video_manager.processing_format = 'gray' if luma_only else 'rgb24'
 
     def open_video(self):
         path = filedialog.askopenfilename(
             title="Select Video File",
-            filetypes=[("Video Files", "*.mp4 *.mov *.avi *.mkv *.wmv *.flv *.webm"), ("All Files", "*")]
+            filetypes=_VIDEO_FILETYPES
         )
         if not path:
             return
@@ -183,34 +250,37 @@ class MainWindow(tk.Tk):
             # Load new video
             self.video_manager.open(path)
             
-            # Give Video a moment to load the media
-            self.after(500, lambda: self._start_video_playback(path))
+            # open() returns once the container and stream are ready
+            self._start_video_playback(path)
             
         except Exception as e:
-            logger.error(f"Video loading error: {e}")
-            self.status_msg.config(text=f"Error loading video: {e}")
-            messagebox.showerror("Video Error", f"Failed to load video:\n{e}")
+            logger.error("Video loading error: %s", e)
+            self._show_status_error(f"Error loading video: {e}")
 
     def _start_video_playback(self, path):
         """Start video playback after media is loaded."""
         try:
+            self._refresh_active_generators()
             self.video_manager.play()
-            self.status_msg.config(text=f"Playing: {os.path.basename(path)}")
+            self._cache_media_constants(os.path.basename(path))
+            self._kick_playback_timers()
+            self.status_var.set(f"Playing: {self._media_constants['label']}")
                 
         except Exception as e:
-            logger.error(f"Playback error: {e}")
-            self.status_msg.config(text=f"Playback error: {e}")
+            logger.error("Playback error: %s", e)
+            self._show_status_error(f"Playback error: {e}")
 
-    def _process_ui_updates(self):
-        """Process UI updates from video manager in main thread."""
-        if self.video_manager:
-            self.video_manager.process_ui_updates()
-        
-        # Schedule next update
-        if self.video_manager and self.video_manager.is_playing():
-            self.after(33, self._process_ui_updates)  # ~30 FPS UI updates
-        else:
-            self.after(100, self._process_ui_updates)  # Slower polling when not playing
+    def _show_status_error(self, text):
+        """Shows an error in the status bar without blocking the event loop like a modal would."""
+        self.status_var.set(text)
+        self.status_msg.config(foreground='red')
+        if self.status_error_timer_id:
+            self.after_cancel(self.status_error_timer_id)
+        self.status_error_timer_id = self.after(4000, self._clear_status_error)
+
+    def _clear_status_error(self):
+        self.status_error_timer_id = None
+        self.status_msg.config(foreground='')
 
     def reload_video(self):
         """Reloads current video or camera source."""
@@ -223,126 +293,200 @@ class MainWindow(tk.Tk):
 
     def play_video(self):
         if self.video_manager:
+            self._refresh_active_generators()
             self.video_manager.play()
+            self._kick_playback_timers()
 
     def pause_video(self):
         if self.video_manager:
             self.video_manager.pause()
-            for track in self.tracks:
-                if track.audio_generator:
-                    track.audio_generator.stop_all_notes()
+            for stop_all_notes in self._stop_note_callables:
+                stop_all_notes()
 
     def stop_video(self):
         if self.video_manager:
             self.video_manager.stop()
-            for track in self.tracks:
-                if track.audio_generator:
-                    track.audio_generator.stop_all_notes()
-            self.stats_lbl.config(text="FPS: -- | Target FPS: -- | Latency: -- | Target Latency: --")
+            for stop_all_notes in self._stop_note_callables:
+                stop_all_notes()
+            self.stats_var.set("FPS: -- | Target FPS: -- | Latency: -- | Target Latency: --")
+            self._last_stats_text = None
+            self._media_constants = None
+
+    def _kick_playback_timers(self):
+        """Refreshes the stats and grid overlay on the next idle tick instead of waiting for the timer."""
+        self._next_stats_at = 0.0
+        self._request_grid_redraw()
+
+    def _cache_media_constants(self, label: str):
+        """Derives the status bar values that stay fixed for the loaded media."""
+        video_fps = self.video_manager.get_fps()
+        target_latency_ms = (1000.0 / video_fps) if video_fps > 0 else 0.0
+        self._media_constants = {
+            'video_fps': video_fps,
+            'target_latency_ms': target_latency_ms,
+            'label': label,
+            'overlay_interval_ms': max(self.ui_config.GRID_OVERLAY_MIN_MS, int(1000.0 / video_fps)) if video_fps > 0 else 50,
+            # Target fields are filled in now; only the measured ones are formatted per tick
+            'stats_format': ("FPS: {:.1f} | Target FPS: %.1f | Latency: {:.2f}ms | Target Latency: <%.2fms"
+                             % (video_fps, target_latency_ms)),
+        }
 
     def _update_stats(self):
-        if self.video_manager and self.video_manager.is_playing():
-            video_fps = self.video_manager.get_fps()
-            current_fps = self.video_manager.get_current_fps()
-            latency_s = self.video_manager.get_latency()
-            
-            target_latency_s = (1.0 / video_fps) if video_fps > 0 else 0
-            
-            stats_text = (f"FPS: {current_fps:.1f} | "
-                          f"Target FPS: {video_fps:.1f} | "
-                          f"Latency: {latency_s * 1000:.2f}ms | "
-                          f"Target Latency: <{target_latency_s * 1000:.2f}ms")
+        # Paused or stopped playback keeps the last stats on screen
+        if not (self.video_manager and self._media_constants):
+            return
+        playing, current_fps, latency_s = self.video_manager.get_stats_snapshot()
+        if not playing:
+            return
 
-            self.stats_lbl.config(text=stats_text)
-            
-            # Schedule the next update
-            self.after(500, self._update_stats)
-        else:
-            # If not playing, check again in a bit without resetting the label immediately,
-            # allowing stats to persist during pause.
-            self.after(500, self._update_stats)
+        stats_text = self._media_constants['stats_format'].format(current_fps, latency_s * 1000)
+        if stats_text != self._last_stats_text:
+            self.stats_var.set(stats_text)
+            self._last_stats_text = stats_text
+
+    def _request_grid_redraw(self):
+        """Coalesces redraw requests into one grid overlay refresh when Tk is next idle."""
+        if self._grid_redraw_pending:
+            return
+        if self.grid_overlay_timer_id:
+            self.after_cancel(self.grid_overlay_timer_id)
+        self._grid_redraw_pending = True
+        self._grid_notes_seen = None
+        self.grid_overlay_timer_id = self.after_idle(self._update_grid_overlay)
 
     def _update_grid_overlay(self):
-        """Re-draw grid lines and flashing notes for the active track."""
+        """Periodic UI tick: refreshes changed grid cells for the active track and, when due, the stats."""
         if self.grid_overlay_timer_id:
             self.after_cancel(self.grid_overlay_timer_id)
             self.grid_overlay_timer_id = None
+        self._grid_redraw_pending = False
      
-        start_time = time.time()
-        update_interval = 50  # ms
+        # Follow the source frame rate while playing; notes cannot change faster than frames arrive
+        if self._media_constants and self.video_manager and self.video_manager.is_playing():
+            update_interval = self._media_constants['overlay_interval_ms']
+            # Stats ride on this tick rather than waking Tk on a timer of their own
+            now = time.monotonic()
+            if now >= self._next_stats_at:
+                self._next_stats_at = now + self.ui_config.STATS_INTERVAL_MS / 1000
+                self._update_stats()
+        else:
+            update_interval = self.ui_config.GRID_OVERLAY_IDLE_MS
         
-        self.grid_canvas.delete("all")
-
-        w = self.grid_canvas.winfo_width()
-        h = self.grid_canvas.winfo_height()
+        w, h = self._grid_canvas_w, self._grid_canvas_h
         active_track = self.get_active_track()
         
         if not active_track or w <= 1 or h <= 1:
+            if self._grid_layout_key is not None:
+                self.grid_canvas.delete("all")
+                self._grid_layout_key = None
             self.grid_overlay_timer_id = self.after(update_interval, self._update_grid_overlay)
             return
         
         gw, gh = active_track.grid_width, active_track.grid_height
+        if self._grid_layout_key != (w, h, gw, gh):
+            self._build_grid_items(w, h, gw, gh)
+
+        generator = active_track.audio_generator
+        if generator:
+            # Read the version before the snapshot so a change in between is picked up next tick
+            notes_key = (generator, generator.get_notes_version(), generator.get_mapping_version())
+            if notes_key != self._grid_notes_seen:
+                self._draw_active_notes(generator, gw, gh)
+                self._grid_notes_seen = notes_key
+        elif any(self._cell_states):
+            self._build_grid_items(w, h, gw, gh)
+
+        self.grid_overlay_timer_id = self.after(update_interval, self._update_grid_overlay)
+
+    def _on_grid_resize(self, event):
+        """Caches the grid canvas size, rebuilding the grid only once a window drag settles."""
+        if self.grid_resize_timer_id:
+            self.after_cancel(self.grid_resize_timer_id)
+            self.grid_resize_timer_id = None
+        size = (event.width, event.height)
+        if size == (self._grid_canvas_w, self._grid_canvas_h):
+            return
+        self._grid_pending_size = size
+        if self._grid_canvas_w <= 1 or self._grid_canvas_h <= 1:
+            # Nothing drawn yet, so there is no rebuild to save by waiting
+            self._apply_grid_resize()
+        else:
+            self.grid_resize_timer_id = self.after(self.ui_config.GRID_RESIZE_SETTLE_MS, self._apply_grid_resize)
+
+    def _apply_grid_resize(self):
+        """Adopts the last <Configure> size and redraws the grid at it."""
+        self.grid_resize_timer_id = None
+        self._grid_canvas_w, self._grid_canvas_h = self._grid_pending_size
+        self._request_grid_redraw()
+
+    def _build_grid_items(self, w, h, gw, gh):
+        """Creates the grid lines and one hidden rectangle and label per cell."""
+        self.grid_canvas.delete("all")
         cell_w, cell_h = w//gw, h//gh
 
+        # One polyline for all inner lines: each stroke returns along itself, and the hops
+        # between strokes run along the top and left edges, which the border covers
+        coords = []
         for i in range(1, gw):
             x = i * cell_w
-            self.grid_canvas.create_line(x, 0, x, h, fill='white', width=1)
+            coords += (x, 0, x, h, x, 0)
+        if gh > 1:
+            coords += (0, 0)
         for j in range(1, gh):
             y = j * cell_h
-            self.grid_canvas.create_line(0, y, w, y, fill='white', width=1)
+            coords += (0, y, w, y, 0, y)
+        if len(coords) >= 4:
+            self.grid_canvas.create_line(*coords, fill='white', width=1)
 
         self.grid_canvas.create_rectangle(0, 0, w, h, outline='white', width=2, fill='')
 
-        if active_track.audio_generator:
-            self._draw_active_notes(active_track.audio_generator, gw, gh, cell_w, cell_h)
-
-        self.grid_overlay_timer_id = self.after(update_interval, self._update_grid_overlay)
-
-    def _draw_active_notes(self, audio_generator: AudioGenerator, gw, gh, cell_w, cell_h):
-        """Draw active notes for a specific audio generator."""
+        self._cell_rects = []
+        self._cell_texts = []
+        for region_index in range(gw * gh):
+            row, col = divmod(region_index, gw)
+            x1, y1 = col * cell_w, row * cell_h
+            x2, y2 = x1 + cell_w, y1 + cell_h
+            self._cell_rects.append(self.grid_canvas.create_rectangle(
+                x1 + 1, y1 + 1, x2 - 1, y2 - 1, outline='', width=0, state='hidden'))
+            self._cell_texts.append(self.grid_canvas.create_text(
+                x1 + cell_w // 2, y1 + cell_h // 2, fill='white', font=('Arial', 8), state='hidden'))
+        self._cell_states = [None] * (gw * gh)
+        self._grid_notes_seen = None
+        self._grid_layout_key = (w, h, gw, gh)
+
+    def _draw_active_notes(self, audio_generator: AudioGenerator, gw, gh):
+        """Updates the cells whose note state changed since the last tick."""
         if not audio_generator:
             return
             
         current_notes_snapshot = audio_generator.get_current_notes_snapshot()
-        note_map_copy = {}
-        
-        with audio_generator.state_lock:
-            note_map_copy = audio_generator.note_map.copy()
-        
-        active_track = self.get_active_track()
-        
-        for region_index in range(gw * gh):
-            # Determine the note for this region
-            if active_track and region_index in active_track.audio_generator.custom_note_mapping:
-                note = active_track.audio_generator.custom_note_mapping[region_index]
-                if note == -1:  # Disabled region
-                    # Draw disabled region
-                    row, col = divmod(region_index, gw)
-                    x1, y1 = col * cell_w, row * cell_h
-                    x2, y2 = x1 + cell_w, y1 + cell_h
-                    self.grid_canvas.create_rectangle(x1 + 1, y1 + 1, x2 - 1, y2 - 1, 
-                                                    fill='gray', outline='', width=0)
-                    x_text, y_text = x1 + cell_w // 2, y1 + cell_h // 2
-                    self.grid_canvas.create_text(x_text, y_text, text="OFF", fill='white', font=('Arial', 8))
-                    continue
-            elif region_index in note_map_copy:
-                note = note_map_copy[region_index]
+        _, region_notes = audio_generator.get_region_notes()
+        cell_count = gw * gh
+        if len(region_notes) < cell_count:  # The generator has not caught up with a grid resize yet
+            region_notes += (None,) * (cell_count - len(region_notes))
+
+        cell_states = self._cell_states
+        cell_rects, cell_texts = self._cell_rects, self._cell_texts
+        itemconfigure = self.grid_canvas.itemconfigure
+        
+        for region_index, note in enumerate(region_notes[:cell_count]):
+            if note == -1:  # Disabled region
+                state = ('gray', "OFF")
+            elif note is not None and note in current_notes_snapshot:
+                state = (_VELOCITY_COLORS[min(127, current_notes_snapshot[note])], _NOTE_LABELS[note])
             else:
+                state = None
+
+            if state == cell_states[region_index]:
                 continue
-                
-            if note in current_notes_snapshot:
-                velocity = current_notes_snapshot[note]
-                intensity = 255 - min(255, velocity * 2)
-                color = f"#{255:02x}{intensity:02x}{255:02x}"
-                
-                row, col = divmod(region_index, gw)
-                x1, y1 = col * cell_w, row * cell_h
-                x2, y2 = x1 + cell_w, y1 + cell_h
-                
-                self.grid_canvas.create_rectangle(x1 + 1, y1 + 1, x2 - 1, y2 - 1, fill=color, outline='', width=0)
-                
-                x_text, y_text = x1 + cell_w // 2, y1 + cell_h // 2
-                self.grid_canvas.create_text(x_text, y_text, text=f"N{note}", fill='white', font=('Arial', 8))
+            cell_states[region_index] = state
+            if state is None:
+                itemconfigure(cell_rects[region_index], state='hidden')
+                itemconfigure(cell_texts[region_index], state='hidden')
+            else:
+                fill, label = state
+                itemconfigure(cell_rects[region_index], fill=fill, state='normal')
+                itemconfigure(cell_texts[region_index], text=label, state='normal')
 
     def add_track(self):
         """Adds a new MIDI track and its corresponding UI tab."""
@@ -361,8 +505,10 @@ class MainWindow(tk.Tk):
         self.track_notebook.add(tab_frame, text=f"Track {track_id + 1}")
         
         self.track_notebook.select(len(self.tracks) - 1)
+        self._refresh_active_generators()
+        self._update_processing_format()
         
-        logger.info(f"Added Track {track_id + 1}")
+        logger.info("Added Track %s", track_id + 1)
 
     def remove_track(self):
         """Removes the currently selected MIDI track."""
@@ -372,15 +518,15 @@ class MainWindow(tk.Tk):
 
         selected_index = self.track_notebook.index(self.track_notebook.select())
         track_to_remove = self.tracks[selected_index]
-        logger.info(f"Removing Track {track_to_remove.track_id + 1}")
+        logger.info("Removing Track %s", track_to_remove.track_id + 1)
         
-        track_to_remove.cleanup()
         self.tracks.pop(selected_index)
+        # Stop feeding the generator before tearing it down
+        self._refresh_active_generators()
+        track_to_remove.cleanup()
         self.track_notebook.forget(selected_index)
-        
-        if self.grid_overlay_timer_id:
-            self.after_cancel(self.grid_overlay_timer_id)
-        self.grid_overlay_timer_id = self.after(50, self._update_grid_overlay)
+        self._update_processing_format()
+        self._request_grid_redraw()
 
     def on_track_selected(self, event=None):
         """Handles switching between track tabs."""
@@ -391,9 +537,7 @@ class MainWindow(tk.Tk):
             new_index = self.track_notebook.index(self.track_notebook.select())
             if new_index != self.active_track_index:
                 self.active_track_index = new_index
-                if self.grid_overlay_timer_id:
-                    self.after_cancel(self.grid_overlay_timer_id)
-                self.grid_overlay_timer_id = self.after(0, self._update_grid_overlay)
+                self._request_grid_redraw()
         except (tk.TclError, IndexError):
             self.active_track_index = -1
 
@@ -412,6 +556,8 @@ class MainWindow(tk.Tk):
         
         if not track.audio_enabled and track.audio_generator:
             track.audio_generator.stop_all_notes()
+        self._refresh_active_generators()
+        self._update_processing_format()
 
     def on_metric_change(self, event=None):
         """Handle metric selection change for the active track."""
@@ -423,7 +569,8 @@ class MainWindow(tk.Tk):
             track.current_metric = new_metric
             if track.audio_generator:
                 track.audio_generator.set_metric(track.current_metric)
-            logger.info(f"Track {track.track_id + 1} metric set to {new_metric}")
+            self._update_processing_format()
+            logger.info("Track %s metric set to %s", track.track_id + 1, new_metric)
 
     def _on_sensitivity_change(self, label_widget, *args):
         """Handle sensitivity slider change for the active track."""
@@ -450,6 +597,12 @@ class MainWindow(tk.Tk):
             self.after_cancel(self.update_timer)
         self.update_timer = self.after(150, self.update_track_settings)  # 150ms delay
 
+    def _apply_track_settings(self, event=None):
+        """Applies typed spinbox values straight away, superseding any pending debounced update."""
+        if self.update_timer:
+            self.after_cancel(self.update_timer)
+        self.update_track_settings()
+
     def toggle_invert_metric(self, event=None):
         """Toggles metric inversion for the active track."""
         track = self.get_active_track()
@@ -467,10 +620,10 @@ class MainWindow(tk.Tk):
 
         try:
             # Get values with bounds checking
-            new_width = max(1, min(127, int(track.grid_width_var.get())))
-            new_height = max(1, min(127, int(track.grid_height_var.get())))
-            new_min_note = max(0, min(127, int(track.min_note_var.get())))
-            new_max_note = max(0, min(127, int(track.max_note_var.get())))
+            new_width = max(1, min(127, track.grid_width_var.get()))
+            new_height = max(1, min(127, track.grid_height_var.get()))
+            new_min_note = max(0, min(127, track.min_note_var.get()))
+            new_max_note = max(0, min(127, track.max_note_var.get()))
             
             # Ensure min < max
             if new_min_note >= new_max_note:
@@ -507,12 +660,12 @@ class MainWindow(tk.Tk):
             if track.audio_generator:
                 track.update_audio_generator_settings()
             
-            self._update_grid_overlay()
+            self._request_grid_redraw()
             
         except (ValueError, tk.TclError) as e:
-            logger.warning(f"Invalid track settings input: {e}")
+            logger.warning("Invalid track settings input: %s", e)
         except Exception as e:
-            logger.error(f"Error updating track settings: {e}")
+            logger.error("Error updating track settings: %s", e)
 
     def open_camera(self):
         """Opens a camera device for live video input."""
@@ -523,9 +676,8 @@ class MainWindow(tk.Tk):
         try:
             self._load_camera(camera_index)
         except Exception as e:
-            logger.error(f"Camera error: {e}")
-            self.status_msg.config(text=f"Camera Error: {e}")
-            messagebox.showerror("Camera Error", f"Failed to open camera:\n{e}")
+            logger.error("Camera error: %s", e)
+            self._show_status_error(f"Camera Error: {e}")
 
     def _load_camera(self, camera_index):
         """Loads a camera device with proper error handling."""
@@ -538,17 +690,20 @@ class MainWindow(tk.Tk):
         self.stop_video()
         self.video_manager.open_camera(camera_index)
         
-        # Start playback after initialization
-        self.after(500, lambda: self._start_camera_playback(camera_index))
+        # open_camera() returns once the device is open
+        self._start_camera_playback(camera_index)
 
     def _start_camera_playback(self, camera_index):
         try:
+            self._refresh_active_generators()
             self.video_manager.play()
-            self.status_msg.config(text=f"Camera {camera_index}")
+            self._cache_media_constants(f"Camera {camera_index}")
+            self._kick_playback_timers()
+            self.status_var.set(self._media_constants['label'])
 
         except Exception as e:
-            logger.error(f"Camera playback error: {e}")
-            self.status_msg.config(text=f"Playback error: {e}")
+            logger.error("Camera playback error: %s", e)
+            self._show_status_error(f"Playback error: {e}")
 
     def _populate_midi_devices(self):
         """Populates the MIDI output device menu."""
@@ -571,7 +726,7 @@ class MainWindow(tk.Tk):
     def _on_midi_device_change(self):
         """Handles MIDI output device change and re-initializes audio."""
         selected_id = self.selected_midi_device_id.get()
-        logger.info(f"User selected new MIDI device ID: {selected_id}. Re-initializing audio.")
+        logger.info("User selected new MIDI device ID: %s. Re-initializing audio.", selected_id)
 
         # Stop all notes on all tracks before switching
         for track in self.tracks:
@@ -620,8 +775,7 @@ class MainWindow(tk.Tk):
             return
             
         # Calculate which region was clicked
-        w = self.grid_canvas.winfo_width()
-        h = self.grid_canvas.winfo_height()
+        w, h = self._grid_canvas_w, self._grid_canvas_h
         
         if w <= 1 or h <= 1:
             return
@@ -690,19 +844,12 @@ class MainWindow(tk.Tk):
         if not active_track:
             return
             
-        if note == -1:
-            # Disable region
-            active_track.audio_generator.custom_note_mapping[region_index] = -1
-        else:
-            # Set specific note
-            active_track.audio_generator.custom_note_mapping[region_index] = note
-        
-        # Update audio generator if it exists
+        # Update audio generator if it exists; -1 disables the region
         if active_track.audio_generator:
             active_track.audio_generator.set_custom_note_mapping(region_index, note)
         
         # Refresh grid overlay
-        self._update_grid_overlay()
+        self._request_grid_redraw()
 
     def _get_current_region_note(self, region_index):
         """Get the current note for a region."""
@@ -739,6 +886,14 @@ class MainWindow(tk.Tk):
         if self.update_timer:
             self.after_cancel(self.update_timer)
             self.update_timer = None
+        for timer_id in (self.grid_overlay_timer_id, self.grid_resize_timer_id, self.status_error_timer_id):
+            if timer_id:
+                self.after_cancel(timer_id)
+        self.grid_overlay_timer_id = None
+        self.grid_resize_timer_id = None
+        self._grid_redraw_pending = False
+        self.status_error_timer_id = None
+        self._media_constants = None
         
         logger.info("Cleaning up all tracks and resources...")
         cleanup_errors = []
@@ -765,7 +920,7 @@ class MainWindow(tk.Tk):
             pygame.mixer.quit()
 
         if cleanup_errors:
-            logger.error(f"Cleanup completed with errors: {'; '.join(cleanup_errors)}")
+            logger.error("Cleanup completed with errors: %s", '; '.join(cleanup_errors))
         else:
             logger.info("Cleanup completed successfully")
 